@@ -139,7 +139,7 @@ def cmd_diagnose(agent_id: str, incident_type: str, wallet: str = None):
     """Generate a diagnostic report for an incident."""
     import asyncio
     try:
-        from diagnostic_report import DiagnosticEngine
+        from diagnostic_report import DiagnosticEngine, SOLANASCOPE_AVAILABLE
     except ImportError:
         print("Error: diagnostic_report module not found")
         return
@@ -152,12 +152,17 @@ def cmd_diagnose(agent_id: str, incident_type: str, wallet: str = None):
     
     async def run_diagnosis():
         engine = DiagnosticEngine()
-        report = await engine.diagnose_incident(
-            agent_id=agent_id,
-            incident_type=incident_type,
-            wallet_address=wallet,
-            check_prices=True
-        )
+        try:
+            report = await engine.diagnose_incident(
+                agent_id=agent_id,
+                incident_type=incident_type,
+                wallet_address=wallet,
+                check_prices=True
+            )
+        finally:
+            if SOLANASCOPE_AVAILABLE:
+                from solanascope_integration import close_scope
+                await close_scope()
         return report
     
     report = asyncio.run(run_diagnosis())
@@ -20,7 +20,7 @@ from enum import Enum
 
 # Import other AgentMedic modules
 try:
-    from solanascope_integration import diagnose_counterparty, check_price_reliability
+    from solanascope_integration import diagnose_counterparty, check_price_reliability, close_scope
     SOLANASCOPE_AVAILABLE = True
 except ImportError:
     SOLANASCOPE_AVAILABLE = False
@@ -449,5 +449,13 @@ async def demo():
     print(report.to_json())
 
 
+async def _run_demo():
+    try:
+        await demo()
+    finally:
+        if SOLANASCOPE_AVAILABLE:
+            await close_scope()
+
+
 if __name__ == "__main__":
-    asyncio.run(demo())
+    asyncio.run(_run_demo())
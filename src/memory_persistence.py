@@ -20,9 +20,13 @@ Safety:
 import json
 import hashlib
 import base64
+import math
+import re
+import sys
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, List, Deque
+from dataclasses import dataclass, fields
 from enum import Enum
 
 # Solana imports (optional - for future on-chain storage)
@@ -32,6 +36,45 @@ try:
 except ImportError:
     SOLANA_AVAILABLE = False
 
+# orjson (optional - faster snapshot (de)serialization)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# xxhash (optional - fast non-cryptographic checksums, see checksum_algorithm)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Canonical encoding hashed by _compute_checksum, built once: json.dumps
+# constructs a fresh encoder on every call that passes sort_keys. Kept on
+# stdlib json so checksums stay byte-compatible across installs
+_canonical_json = json.JSONEncoder(sort_keys=True).encode
+
+# orjson reads integers of 20+ digits (wider than 64 bits) back as floats, so
+# documents containing such a digit run are parsed with stdlib json
+_LONG_DIGITS_RE = re.compile(r'\d{20}')
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    """Check nested dicts/lists for NaN or infinity, which orjson writes as null."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
 
 class StorageBackend(Enum):
     """Supported storage backends for memory persistence."""
@@ -41,7 +84,7 @@ class StorageBackend(Enum):
     LOCAL = "local"              # Local file backup (fallback)
 
 
-@dataclass
+@dataclass(slots=True)
 class MemorySnapshot:
     """A point-in-time snapshot of agent memory."""
     agent_id: str
@@ -51,14 +94,42 @@ class MemorySnapshot:
     checksum: str
     storage_backend: str
     storage_ref: Optional[str] = None  # IPFS CID, Arweave TX, or Solana signature
+    # Algorithm that produced checksum; snapshots saved before it existed are SHA-256
+    checksum_algorithm: str = "sha256"
     
     def to_json(self) -> str:
-        return json.dumps(asdict(self), indent=2)
+        if ORJSON_AVAILABLE and not _has_non_finite_float(self.data):
+            try:
+                # orjson serializes dataclasses natively, without asdict's deep copy
+                return orjson.dumps(
+                    self, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode()
+            except TypeError:
+                pass  # e.g. an int wider than 64 bits - stdlib json handles it
+        # Flat field view; data is already JSON-shaped, so asdict's deep copy is wasted
+        return json.dumps({name: getattr(self, name) for name in _SNAPSHOT_FIELDS}, indent=2)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'MemorySnapshot':
-        data = json.loads(json_str)
-        return cls(**data)
+        if ORJSON_AVAILABLE and _LONG_DIGITS_RE.search(json_str) is None:
+            try:
+                return cls(**orjson.loads(json_str))
+            except orjson.JSONDecodeError:
+                pass  # NaN/Infinity literals written by stdlib json
+        return cls(**json.loads(json_str))
+
+
+_SNAPSHOT_FIELDS = tuple(f.name for f in fields(MemorySnapshot))
+
+CHECKSUM_ALGORITHMS = ("sha256", "xxh3")
+
+
+def _require_checksum_algorithm(algorithm: str):
+    """Raise if algorithm is unknown or needs a package that is not installed."""
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"Unknown checksum algorithm: {algorithm}")
+    if algorithm == "xxh3" and not XXHASH_AVAILABLE:
+        raise ImportError("checksum_algorithm='xxh3' requires the xxhash package")
 
 
 class MemoryPersistence:
@@ -77,19 +148,31 @@ class MemoryPersistence:
         agent_id: str,
         solana_rpc: Optional[Any] = None,
         storage_backend: StorageBackend = StorageBackend.LOCAL,
-        encryption_key: Optional[str] = None
+        encryption_key: Optional[str] = None,
+        checksum_algorithm: str = "sha256",  # or "xxh3": faster, not tamper-proof
+        max_history: Optional[int] = 1024  # Snapshots kept in memory; None = unbounded
     ):
-        self.agent_id = agent_id
+        _require_checksum_algorithm(checksum_algorithm)
+        if max_history is not None and max_history < 1:
+            raise ValueError(f"max_history must be at least 1: {max_history}")
+        self.agent_id = sys.intern(agent_id)  # Shared by every snapshot it creates
         self.solana_rpc = solana_rpc  # Reserved for future on-chain storage
         self.storage_backend = storage_backend
         self.encryption_key = encryption_key
+        self.checksum_algorithm = checksum_algorithm
         self.version = 0
-        self.snapshots: List[MemorySnapshot] = []
+        self.snapshots: Deque[MemorySnapshot] = deque(maxlen=max_history)
+        self._by_version: Dict[int, MemorySnapshot] = {}
         
-    def _compute_checksum(self, data: Dict[str, Any]) -> str:
-        """Compute SHA-256 checksum of memory data."""
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+    def _compute_checksum(self, data: Dict[str, Any], algorithm: Optional[str] = None) -> str:
+        """Compute checksum of memory data (truncated SHA-256, or XXH3-64).
+        
+        Uses the manager's checksum_algorithm unless one is given.
+        """
+        payload = _canonical_json(data).encode()
+        if (algorithm or self.checksum_algorithm) == "xxh3":
+            return xxhash.xxh3_64_hexdigest(payload)
+        return hashlib.sha256(payload).hexdigest()[:16]
     
     def _encrypt(self, data: str) -> str:
         """Encrypt data before storage (placeholder - implement with proper crypto)."""
@@ -116,10 +199,15 @@ class MemoryPersistence:
             version=self.version,
             data=memory_data,
             checksum=self._compute_checksum(memory_data),
-            storage_backend=self.storage_backend.value
+            storage_backend=self.storage_backend.value,
+            checksum_algorithm=self.checksum_algorithm
         )
         
+        if len(self.snapshots) == self.snapshots.maxlen:
+            # Oldest snapshot is about to be dropped from the history
+            del self._by_version[self.snapshots[0].version]
         self.snapshots.append(snapshot)
+        self._by_version[snapshot.version] = snapshot
         return snapshot
     
     async def save_to_solana_memo(self, snapshot: MemorySnapshot) -> Optional[str]:
@@ -141,6 +229,8 @@ class MemoryPersistence:
             "checksum": snapshot.checksum,
             "ref": snapshot.storage_ref  # IPFS/Arweave reference if used
         }
+        if snapshot.checksum_algorithm != "sha256":
+            memo_data["alg"] = snapshot.checksum_algorithm  # Default omitted for space
         
         memo_json = json.dumps(memo_data, separators=(',', ':'))
         
@@ -154,7 +244,7 @@ class MemoryPersistence:
     def save_to_local(self, snapshot: MemorySnapshot, filepath: str) -> bool:
         """Save memory snapshot to local file (fallback storage)."""
         try:
-            with open(filepath, 'w') as f:
+            with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(snapshot.to_json())
             snapshot.storage_ref = filepath
             print(f"[Memory] Saved snapshot v{snapshot.version} to {filepath}")
@@ -166,7 +256,7 @@ class MemoryPersistence:
     def load_from_local(self, filepath: str) -> Optional[MemorySnapshot]:
         """Load memory snapshot from local file."""
         try:
-            with open(filepath, 'r') as f:
+            with open(filepath, 'r', encoding='utf-8') as f:
                 return MemorySnapshot.from_json(f.read())
         except Exception as e:
             print(f"[Memory] Error loading from local: {e}")
@@ -233,14 +323,16 @@ class MemoryPersistence:
     
     def get_snapshot_by_version(self, version: int) -> Optional[MemorySnapshot]:
         """Get a specific version of memory snapshot."""
-        for snapshot in self.snapshots:
-            if snapshot.version == version:
-                return snapshot
-        return None
+        return self._by_version.get(version)
     
     def verify_integrity(self, snapshot: MemorySnapshot) -> bool:
-        """Verify snapshot data integrity via checksum."""
-        computed = self._compute_checksum(snapshot.data)
+        """Verify snapshot data integrity via checksum.
+        
+        The checksum is recomputed with the algorithm recorded on the
+        snapshot, whatever this manager uses for new snapshots.
+        """
+        _require_checksum_algorithm(snapshot.checksum_algorithm)
+        computed = self._compute_checksum(snapshot.data, snapshot.checksum_algorithm)
         is_valid = computed == snapshot.checksum
         
         if not is_valid:
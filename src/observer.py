@@ -12,6 +12,13 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+# httpx (optional - endpoint checks over the shared keep-alive client)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 from config import AgentConfig, AgentStatus, config, get_agent, list_agents
 import solana_rpc
 
@@ -90,14 +97,19 @@ def check_health_endpoint(url: str, timeout: int = 10) -> Dict[str, Any]:
     
     try:
         start = time.time()
-        proc = subprocess.run(
-            ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}", 
-             "--max-time", str(timeout), url],
-            capture_output=True, text=True, timeout=timeout + 5
-        )
+        if HTTPX_AVAILABLE:
+            # Shared keep-alive client: repeated checks (e.g. verifier polls)
+            # reuse the connection instead of spawning curl each time
+            status_code = solana_rpc.get_http_client().get(url, timeout=timeout).status_code
+        else:
+            proc = subprocess.run(
+                ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}", 
+                 "--max-time", str(timeout), url],
+                capture_output=True, text=True, timeout=timeout + 5
+            )
+            status_code = int(proc.stdout.strip()) if proc.stdout.strip().isdigit() else 0
         latency = (time.time() - start) * 1000
         
-        status_code = int(proc.stdout.strip()) if proc.stdout.strip().isdigit() else 0
         result["status_code"] = status_code
         result["latency_ms"] = round(latency, 2)
         result["healthy"] = 200 <= status_code < 300
@@ -105,7 +117,10 @@ def check_health_endpoint(url: str, timeout: int = 10) -> Dict[str, Any]:
     except subprocess.TimeoutExpired:
         result["error"] = "Timeout"
     except Exception as e:
-        result["error"] = str(e)
+        if HTTPX_AVAILABLE and isinstance(e, httpx.TimeoutException):
+            result["error"] = "Timeout"
+        else:
+            result["error"] = str(e)
     
     return result
 
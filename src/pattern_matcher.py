@@ -0,0 +1,191 @@
+"""
+AgentMedic Pattern Matcher
+==========================
+Ordered multi-pattern regex matching for the security scanners.
+
+A PatternSet answers "which is the first pattern, in list order, that
+matches this text?" while scanning the text as few times as possible:
+- Hyperscan database (optional, SIMD multi-pattern) when installed
+- Single named-group alternation regex otherwise
+
+Both backends use ASCII semantics for character classes, word boundaries
+and case-insensitive matching, so they report the same matches.
+
+Compiled Hyperscan databases are cached in a private per-user directory
+(mode 0700), keyed by a hash of the pattern list, so later processes skip
+recompilation. A cached file is only loaded if it is a regular file owned
+by the current user and not accessible to anyone else.
+
+A PatternSet can be shared between threads: each thread scans with its own
+Hyperscan scratch space.
+"""
+
+import hashlib
+import json
+import os
+import re
+import stat
+import tempfile
+import threading
+from typing import Iterable, Optional, Tuple
+
+# Hyperscan (optional - SIMD multi-pattern matching)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+def _private_cache_dir() -> Optional[str]:
+    """Per-user Hyperscan cache directory, created 0700; None if it cannot be trusted."""
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:
+        return None  # No POSIX ownership to check - do not cache
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "agentmedic", "hyperscan")
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != getuid():
+            return None
+        if st.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    except OSError:
+        return None
+    return path
+
+
+def _read_private_file(path: str) -> bytes:
+    """Read a file only if it is a regular file owned by us with no group/other access."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(f.fileno())
+        if (not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid()
+                or st.st_mode & 0o077):
+            raise PermissionError(f"Untrusted cache file: {path}")
+        return f.read()
+
+
+class PatternSet:
+    """Ordered set of regex patterns matched as a unit."""
+
+    def __init__(self, patterns: Iterable[str], flags: int = 0):
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        self.flags = flags
+        # Hyperscan classes (\b, \w, \d, \s) and case folding are ASCII-only,
+        # so the re backend is too; results never depend on which is installed
+        re_flags = flags | re.ASCII
+        self._compiled = tuple(re.compile(p, re_flags) for p in self.patterns)
+        self._union = re.compile(
+            "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(self.patterns)),
+            re_flags
+        )
+        # Built on first use; False once Hyperscan has rejected the patterns
+        self._hs_db = None
+        self._hs_lock = threading.Lock()
+        # A scratch space serves one scan at a time, so each thread gets its own
+        self._hs_local = threading.local()
+
+    def first_match(self, text: str) -> Optional[str]:
+        """Return the source of the first pattern, in list order, that matches text."""
+        if HYPERSCAN_AVAILABLE and self._hs_db is not False:
+            db = self._get_hs_db()
+            if db:
+                return self._first_match_hyperscan(db, text)
+        return self._first_match_re(text)
+
+    def _first_match_re(self, text: str) -> Optional[str]:
+        # One pass of the union settles the common no-match case; on a hit
+        # only the patterns listed before the matched alternative are re-checked.
+        m = self._union.search(text)
+        if m is None:
+            return None
+        hit = int(m.lastgroup[1:])
+        for regex, pattern in zip(self._compiled[:hit], self.patterns):
+            if regex.search(text):
+                return pattern
+        return self.patterns[hit]
+
+    def _get_hs_db(self):
+        if self._hs_db is None:
+            with self._hs_lock:
+                if self._hs_db is None:
+                    try:
+                        self._hs_db = self._compile_hs_db()
+                    except Exception:
+                        # Pattern unsupported by Hyperscan - stay on the re backend
+                        self._hs_db = False
+        return self._hs_db
+
+    def _get_hs_scratch(self, db):
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None or self._hs_local.db is not db:
+            scratch = hyperscan.Scratch(db)
+            self._hs_local.scratch = scratch
+            self._hs_local.db = db
+        return scratch
+
+    def _compile_hs_db(self):
+        hs_flags = hyperscan.HS_FLAG_SINGLEMATCH
+        if self.flags & re.IGNORECASE:
+            hs_flags |= hyperscan.HS_FLAG_CASELESS
+        if self.flags & re.DOTALL:
+            hs_flags |= hyperscan.HS_FLAG_DOTALL
+
+        cache_path = self._hs_cache_path(hs_flags)
+        if cache_path is not None:
+            try:
+                return hyperscan.loadb(bytearray(_read_private_file(cache_path)), hyperscan.HS_MODE_BLOCK)
+            except Exception:
+                pass  # Missing, untrusted, unreadable or incompatible - recompile
+
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.encode() for p in self.patterns],
+            ids=list(range(len(self.patterns))),
+            elements=len(self.patterns),
+            flags=[hs_flags] * len(self.patterns),
+        )
+        if cache_path is not None:
+            self._write_hs_cache(cache_path, db)
+        return db
+
+    def _hs_cache_path(self, hs_flags: int) -> Optional[str]:
+        cache_dir = _private_cache_dir()
+        if cache_dir is None:
+            return None
+        key_source = json.dumps([getattr(hyperscan, "__version__", ""), hs_flags, self.patterns])
+        key = hashlib.sha256(key_source.encode()).hexdigest()[:32]
+        return os.path.join(cache_dir, f"patterns_{key}.hsdb")
+
+    @staticmethod
+    def _write_hs_cache(cache_path: str, db):
+        # Write to a private (0600) temp file and rename so readers never see a partial file
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(hyperscan.dumpb(db))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Cache is best-effort
+
+    def _first_match_hyperscan(self, db, text: str) -> Optional[str]:
+        hits = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            hits.append(pattern_id)
+            # Nothing can precede the first pattern - stop scanning
+            return pattern_id == 0
+
+        try:
+            db.scan(
+                text.encode("utf-8", "surrogatepass"),
+                match_event_handler=on_match,
+                scratch=self._get_hs_scratch(db),
+            )
+        except hyperscan.ScanTerminated:
+            pass
+        if not hits:
+            return None
+        return self.patterns[min(hits)]
@@ -1,10 +1,13 @@
 """
 AgentMedic Rate Limiter
 =======================
-Token bucket rate limiter for API calls.
+Token bucket rate limiter for API calls, plus a concurrency limiter that
+caps in-flight async requests.
 """
 
+import asyncio
 import time
+import weakref
 from dataclasses import dataclass
 from typing import Dict
 
@@ -53,6 +56,35 @@ class RateLimiter:
         return wait_time
 
 
+class ConcurrencyLimiter:
+    """
+    Cap on in-flight async requests: `async with limiter: ...`.
+    
+    Keeps one asyncio.Semaphore per event loop, since a semaphore cannot be
+    shared across loops (CLI paths call asyncio.run() repeatedly).
+    """
+    
+    def __init__(self, max_concurrent: int = 8):
+        self.max_concurrent = max_concurrent
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphores[loop] = semaphore
+        return semaphore
+    
+    async def __aenter__(self):
+        await self._semaphore().acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore().release()
+
+
 _limiters: Dict[str, RateLimiter] = {}
 
 def get_limiter(name: str, config: RateLimitConfig = None) -> RateLimiter:
@@ -61,5 +93,13 @@ def get_limiter(name: str, config: RateLimitConfig = None) -> RateLimiter:
     return _limiters[name]
 
 
+_concurrency_limiters: Dict[str, ConcurrencyLimiter] = {}
+
+def get_concurrency_limiter(name: str, max_concurrent: int = 8) -> ConcurrencyLimiter:
+    if name not in _concurrency_limiters:
+        _concurrency_limiters[name] = ConcurrencyLimiter(max_concurrent)
+    return _concurrency_limiters[name]
+
+
 RPC_LIMITER = RateLimitConfig(tokens_per_second=5, max_tokens=20)
 API_LIMITER = RateLimitConfig(tokens_per_second=2, max_tokens=10)
@@ -6,6 +6,7 @@ SAFETY: Never signs transactions, never handles funds, never exposes secrets.
 """
 
 import subprocess
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Callable
@@ -34,7 +35,7 @@ class RecoveryStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class RecoveryPlan:
     """Plan for recovering from an incident."""
     incident_id: str
@@ -45,7 +46,7 @@ class RecoveryPlan:
     reason: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class RecoveryResult:
     """Result of a recovery attempt."""
     incident_id: str
@@ -87,6 +88,26 @@ class Recoverer:
             self.restart_attempts[agent_name] = []
         self.restart_attempts[agent_name].append(datetime.utcnow())
     
+    def _make_result(
+        self,
+        plan: RecoveryPlan,
+        status: RecoveryStatus,
+        message: str,
+        start_time: float,
+        timestamp: str,
+        **details
+    ) -> RecoveryResult:
+        """Build a RecoveryResult for a plan, measuring duration from start_time."""
+        return RecoveryResult(
+            plan.incident_id,
+            plan.action,
+            status,
+            timestamp,
+            time.time() - start_time,
+            message,
+            details  # **details is already a fresh dict per call
+        )
+    
     def plan_action(self, incident: Incident) -> RecoveryPlan:
         """Determine the appropriate recovery action for an incident."""
         
@@ -184,46 +205,26 @@ class Recoverer:
                 return self._execute_cooldown(plan, start_time, timestamp)
             
             elif plan.action == RecoveryAction.ALERT_HUMAN:
-                return RecoveryResult(
-                    incident_id=plan.incident_id,
-                    action=plan.action,
-                    status=RecoveryStatus.SKIPPED,
-                    timestamp=timestamp,
-                    duration_seconds=time.time() - start_time,
-                    message=f"Human intervention required: {plan.reason}",
-                    details={"requires_human": True}
+                return self._make_result(
+                    plan, RecoveryStatus.SKIPPED, f"Human intervention required: {plan.reason}",
+                    start_time, timestamp, requires_human=True
                 )
             
             elif plan.action == RecoveryAction.NO_ACTION:
-                return RecoveryResult(
-                    incident_id=plan.incident_id,
-                    action=plan.action,
-                    status=RecoveryStatus.SKIPPED,
-                    timestamp=timestamp,
-                    duration_seconds=time.time() - start_time,
-                    message="No action taken",
-                    details={}
+                return self._make_result(
+                    plan, RecoveryStatus.SKIPPED, "No action taken",
+                    start_time, timestamp
                 )
             
         except Exception as e:
-            return RecoveryResult(
-                incident_id=plan.incident_id,
-                action=plan.action,
-                status=RecoveryStatus.FAILED,
-                timestamp=timestamp,
-                duration_seconds=time.time() - start_time,
-                message=f"Recovery failed: {str(e)}",
-                details={"error": str(e)}
+            return self._make_result(
+                plan, RecoveryStatus.FAILED, f"Recovery failed: {str(e)}",
+                start_time, timestamp, error=str(e)
             )
         
-        return RecoveryResult(
-            incident_id=plan.incident_id,
-            action=plan.action,
-            status=RecoveryStatus.SKIPPED,
-            timestamp=timestamp,
-            duration_seconds=time.time() - start_time,
-            message="Unknown action",
-            details={}
+        return self._make_result(
+            plan, RecoveryStatus.SKIPPED, "Unknown action",
+            start_time, timestamp
         )
     
     def _execute_restart(self, plan: RecoveryPlan, start_time: float, timestamp: str) -> RecoveryResult:
@@ -246,14 +247,9 @@ class Recoverer:
                 )
                 if result.returncode == 0:
                     self._record_restart(plan.agent_name)
-                    return RecoveryResult(
-                        incident_id=plan.incident_id,
-                        action=plan.action,
-                        status=RecoveryStatus.SUCCESS,
-                        timestamp=timestamp,
-                        duration_seconds=time.time() - start_time,
-                        message=f"Restarted '{plan.agent_name}' via custom command",
-                        details={"method": "custom_command", "backoff_applied": backoff}
+                    return self._make_result(
+                        plan, RecoveryStatus.SUCCESS, f"Restarted '{plan.agent_name}' via custom command",
+                        start_time, timestamp, method="custom_command", backoff_applied=backoff
                     )
             except Exception:
                 pass
@@ -269,14 +265,9 @@ class Recoverer:
             )
             if result.returncode == 0:
                 self._record_restart(plan.agent_name)
-                return RecoveryResult(
-                    incident_id=plan.incident_id,
-                    action=plan.action,
-                    status=RecoveryStatus.SUCCESS,
-                    timestamp=timestamp,
-                    duration_seconds=time.time() - start_time,
-                    message=f"Restarted '{process_name}' via systemctl",
-                    details={"method": "systemctl", "backoff_applied": backoff}
+                return self._make_result(
+                    plan, RecoveryStatus.SUCCESS, f"Restarted '{process_name}' via systemctl",
+                    start_time, timestamp, method="systemctl", backoff_applied=backoff
                 )
         except Exception:
             pass
@@ -291,26 +282,16 @@ class Recoverer:
             )
             if result.returncode == 0:
                 self._record_restart(plan.agent_name)
-                return RecoveryResult(
-                    incident_id=plan.incident_id,
-                    action=plan.action,
-                    status=RecoveryStatus.SUCCESS,
-                    timestamp=timestamp,
-                    duration_seconds=time.time() - start_time,
-                    message=f"Restarted '{process_name}' via docker",
-                    details={"method": "docker", "backoff_applied": backoff}
+                return self._make_result(
+                    plan, RecoveryStatus.SUCCESS, f"Restarted '{process_name}' via docker",
+                    start_time, timestamp, method="docker", backoff_applied=backoff
                 )
         except Exception:
             pass
         
-        return RecoveryResult(
-            incident_id=plan.incident_id,
-            action=plan.action,
-            status=RecoveryStatus.FAILED,
-            timestamp=timestamp,
-            duration_seconds=time.time() - start_time,
-            message=f"Failed to restart '{plan.agent_name}' via any method",
-            details={"tried": ["custom_command", "systemctl", "docker"]}
+        return self._make_result(
+            plan, RecoveryStatus.FAILED, f"Failed to restart '{plan.agent_name}' via any method",
+            start_time, timestamp, tried=["custom_command", "systemctl", "docker"]
         )
     
     def _execute_switch_rpc(self, plan: RecoveryPlan, start_time: float, timestamp: str) -> RecoveryResult:
@@ -318,14 +299,9 @@ class Recoverer:
         self.current_rpc_index = (self.current_rpc_index + 1) % len(self.rpc_endpoints)
         new_rpc = self.rpc_endpoints[self.current_rpc_index]
         
-        return RecoveryResult(
-            incident_id=plan.incident_id,
-            action=plan.action,
-            status=RecoveryStatus.SUCCESS,
-            timestamp=timestamp,
-            duration_seconds=time.time() - start_time,
-            message=f"Switched to RPC endpoint: {new_rpc}",
-            details={"new_endpoint": new_rpc}
+        return self._make_result(
+            plan, RecoveryStatus.SUCCESS, f"Switched to RPC endpoint: {new_rpc}",
+            start_time, timestamp, new_endpoint=new_rpc
         )
     
     def _execute_cooldown(self, plan: RecoveryPlan, start_time: float, timestamp: str) -> RecoveryResult:
@@ -333,22 +309,28 @@ class Recoverer:
         cooldown = plan.parameters.get("cooldown_seconds", 60)
         time.sleep(cooldown)
         
-        return RecoveryResult(
-            incident_id=plan.incident_id,
-            action=plan.action,
-            status=RecoveryStatus.SUCCESS,
-            timestamp=timestamp,
-            duration_seconds=time.time() - start_time,
-            message=f"Applied {cooldown}s cooldown",
-            details={"cooldown_seconds": cooldown}
+        return self._make_result(
+            plan, RecoveryStatus.SUCCESS, f"Applied {cooldown}s cooldown",
+            start_time, timestamp, cooldown_seconds=cooldown
         )
 
 
-# Global recoverer instance
-recoverer = Recoverer()
+# Global recoverer instance (created on first use)
+_recoverer: Optional[Recoverer] = None
+_recoverer_lock = threading.Lock()
+
+def get_recoverer() -> Recoverer:
+    global _recoverer
+    recoverer = _recoverer
+    if recoverer is None:
+        with _recoverer_lock:
+            if _recoverer is None:
+                _recoverer = Recoverer()
+            recoverer = _recoverer
+    return recoverer
 
 def plan_action(incident: Incident) -> RecoveryPlan:
-    return recoverer.plan_action(incident)
+    return get_recoverer().plan_action(incident)
 
 def execute(plan: RecoveryPlan) -> RecoveryResult:
-    return recoverer.execute(plan)
+    return get_recoverer().execute(plan)
@@ -7,19 +7,20 @@ Configurable retry logic with exponential backoff.
 import time
 import random
 from dataclasses import dataclass
-from typing import Callable, Optional, TypeVar, Any
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar, Any, Literal
 from functools import wraps
 
 T = TypeVar('T')
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryConfig:
     max_attempts: int = 3
     base_delay: float = 1.0
     max_delay: float = 60.0
     exponential_base: float = 2.0
     jitter: bool = True
+    jitter_strategy: Literal["none", "equal", "full", "decorrelated"] = "full"
 
 
 class RetryError(Exception):
@@ -30,15 +31,28 @@ class RetryError(Exception):
         self.last_error = last_error
 
 
-def calculate_delay(attempt: int, config: RetryConfig) -> float:
-    """Calculate delay with exponential backoff and optional jitter."""
-    delay = config.base_delay * (config.exponential_base ** attempt)
-    delay = min(delay, config.max_delay)
+def calculate_delay(attempt: int, config: RetryConfig, previous_delay: Optional[float] = None) -> float:
+    """
+    Calculate delay with capped exponential backoff and optional jitter.
     
-    if config.jitter:
-        delay = delay * (0.5 + random.random())
+    Strategies:
+    - none: capped exponential delay
+    - equal: half the capped delay plus a random half
+    - full: uniform between 0 and the capped delay (default)
+    - decorrelated: uniform between base_delay and 3x the previous delay, capped
+    """
+    capped = min(config.base_delay * (config.exponential_base ** attempt), config.max_delay)
+    strategy = config.jitter_strategy if config.jitter else "none"
     
-    return delay
+    if strategy == "full":
+        return random.uniform(0, capped)
+    if strategy == "equal":
+        return capped / 2 + random.uniform(0, capped / 2)
+    if strategy == "decorrelated":
+        previous = previous_delay if previous_delay is not None else config.base_delay
+        return min(config.max_delay, random.uniform(config.base_delay, previous * 3))
+    
+    return capped
 
 
 def retry(config: Optional[RetryConfig] = None):
@@ -50,6 +64,7 @@ def retry(config: Optional[RetryConfig] = None):
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             last_error = None
+            delay = None
             
             for attempt in range(config.max_attempts):
                 try:
@@ -57,7 +72,7 @@ def retry(config: Optional[RetryConfig] = None):
                 except Exception as e:
                     last_error = e
                     if attempt < config.max_attempts - 1:
-                        delay = calculate_delay(attempt, config)
+                        delay = calculate_delay(attempt, config, delay)
                         time.sleep(delay)
             
             raise RetryError(
@@ -82,6 +97,7 @@ async def retry_async(
         config = RetryConfig()
     
     last_error = None
+    delay = None
     
     for attempt in range(config.max_attempts):
         try:
@@ -89,7 +105,7 @@ async def retry_async(
         except Exception as e:
             last_error = e
             if attempt < config.max_attempts - 1:
-                delay = calculate_delay(attempt, config)
+                delay = calculate_delay(attempt, config, delay)
                 await asyncio.sleep(delay)
     
     raise RetryError(
@@ -99,6 +115,33 @@ async def retry_async(
     )
 
 
+async def retry_on_status(
+    send: Callable[[], Awaitable[Any]],
+    config: Optional[RetryConfig] = None,
+    retry_statuses: Tuple[int, ...] = (429,)
+) -> Any:
+    """
+    Await send() for an HTTP response, resending with backoff while its
+    status_code is retryable (e.g. 429 rate limit). The last response is
+    returned as-is once attempts run out.
+    """
+    import asyncio
+    
+    if config is None:
+        config = RetryConfig()
+    if config.max_attempts < 1:
+        raise ValueError(f"max_attempts must be at least 1, got {config.max_attempts}")
+    
+    delay = None
+    
+    for attempt in range(config.max_attempts):
+        response = await send()
+        if response.status_code not in retry_statuses or attempt == config.max_attempts - 1:
+            return response
+        delay = calculate_delay(attempt, config, delay)
+        await asyncio.sleep(delay)
+
+
 # Preset configs
 AGGRESSIVE_RETRY = RetryConfig(max_attempts=5, base_delay=0.5, max_delay=30)
 GENTLE_RETRY = RetryConfig(max_attempts=3, base_delay=2.0, max_delay=120)
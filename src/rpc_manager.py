@@ -8,9 +8,10 @@ from dataclasses import dataclass
 from typing import List, Optional
 from datetime import datetime, timezone
 import random
+import threading
 
 
-@dataclass 
+@dataclass(slots=True)
 class RPCEndpoint:
     url: str
     name: str
@@ -76,9 +77,14 @@ class RPCManager:
 
 
 _manager: Optional[RPCManager] = None
+_manager_lock = threading.Lock()
 
 def get_rpc_manager(use_mainnet: bool = False) -> RPCManager:
     global _manager
-    if _manager is None:
-        _manager = RPCManager(use_mainnet=use_mainnet)
-    return _manager
+    manager = _manager
+    if manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = RPCManager(use_mainnet=use_mainnet)
+            manager = _manager
+    return manager
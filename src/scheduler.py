@@ -4,14 +4,17 @@ AgentMedic Task Scheduler
 Schedule and manage periodic tasks.
 """
 
+import logging
 import time
 import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class Task:
     name: str
     callback: Callable
@@ -27,12 +30,25 @@ class Scheduler:
         self.tasks: Dict[str, Task] = {}
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        # Stable view of tasks for the run loop, rebuilt only when the task set changes
+        self._task_snapshot: Tuple[Task, ...] = ()
+        self._tasks_version = 0
+        self._snapshot_version = 0
     
     def add_task(self, name: str, callback: Callable, interval_seconds: float):
         self.tasks[name] = Task(name=name, callback=callback, interval_seconds=interval_seconds)
+        self._tasks_version += 1
     
     def remove_task(self, name: str):
-        self.tasks.pop(name, None)
+        if self.tasks.pop(name, None) is not None:
+            self._tasks_version += 1
+    
+    def _get_task_snapshot(self) -> Tuple[Task, ...]:
+        version = self._tasks_version
+        if version != self._snapshot_version:
+            self._task_snapshot = tuple(self.tasks.values())
+            self._snapshot_version = version
+        return self._task_snapshot
     
     def _should_run(self, task: Task) -> bool:
         if not task.enabled:
@@ -44,13 +60,13 @@ class Scheduler:
     
     def _run_loop(self):
         while self._running:
-            for task in list(self.tasks.values()):
+            for task in self._get_task_snapshot():
                 if self._should_run(task):
                     try:
                         task.callback()
                         task.last_run = datetime.now(timezone.utc)
-                    except Exception as e:
-                        print(f"Task {task.name} error: {e}")
+                    except Exception:
+                        logger.exception("Task %s error", task.name)
             time.sleep(1)
     
     def start(self):
@@ -66,10 +82,15 @@ class Scheduler:
             self._thread.join(timeout=5)
 
 
-_scheduler = None
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
 
 def get_scheduler() -> Scheduler:
     global _scheduler
-    if _scheduler is None:
-        _scheduler = Scheduler()
-    return _scheduler
+    scheduler = _scheduler
+    if scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler()
+            scheduler = _scheduler
+    return scheduler
@@ -12,9 +12,26 @@ Detects:
 """
 
 import re
+import threading
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import Deque, List, Dict, Iterable, Iterator, Optional, Tuple
 from enum import Enum
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from pattern_matcher import PatternSet
+
+# Maximum number of alerts retained in scanner history
+MAX_ALERT_HISTORY = 10_000
+
+# Texts longer than this are scanned without caching to bound cache memory
+MAX_CACHED_TEXT_LEN = 65_536
+
+# Texts longer than this are scanned in windows of whole lines to bound per-call
+# work. No pattern uses DOTALL, so a `.*` match never spans a line break, and a
+# cut at a line break never creates a false word boundary.
+MAX_SCAN_LEN = 256 * 1024
 
 
 class ThreatLevel(Enum):
@@ -25,7 +42,11 @@ class ThreatLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Levels returned by SecurityScanner.get_critical_alerts
+_SEVERE_LEVELS = frozenset((ThreatLevel.CRITICAL, ThreatLevel.HIGH))
+
+
+@dataclass(slots=True)
 class SecurityAlert:
     threat_type: str
     threat_level: ThreatLevel
@@ -39,13 +60,22 @@ class SecurityScanner:
     
     # Private key patterns
     PRIVATE_KEY_PATTERNS = [
-        r'[1-9A-HJ-NP-Za-km-z]{87,88}',  # Solana private key
-        r'0x[a-fA-F0-9]{64}',  # Ethereum-style
+        r'\b[1-9A-HJ-NP-Za-km-z]{87,88}\b',  # Solana private key
+        r'\b0x[a-fA-F0-9]{64}\b',  # Ethereum-style
         r'-----BEGIN.*PRIVATE KEY-----',
         r'privateKey[\s:=]+[\'"][^\'"]+[\'"]',
         r'secret[\s:=]+[\'"][^\'"]+[\'"]',
     ]
     
+    # Cheap literal prefilters: every pattern in a category requires at least
+    # one of these substrings (case-insensitively), so the regexes are only
+    # run when one is present.
+    PRIVATE_KEY_MIN_LENGTH = 87
+    PRIVATE_KEY_LITERALS = ("0x", "-----begin", "privatekey", "secret")
+    DRAINER_LITERALS = ("approv", "0x")
+    PHISHING_LITERALS = ("airdrop", "claim", "verify", ".scam.")
+    EXFIL_LITERALS = ("key", "seed")
+    
     # Drainer attack patterns
     DRAINER_PATTERNS = [
         r'setApprovalForAll.*true',
@@ -86,81 +116,82 @@ class SecurityScanner:
         ".scam.", "verify-wallet", "claim-sol"
     ]
     
-    def __init__(self):
-        self.alerts: List[SecurityAlert] = []
+    # Trusted RPC provider domains; an endpoint is known when its host is one
+    # of these or a subdomain of one
+    KNOWN_PROVIDER_DOMAINS = frozenset((
+        "solana.com",
+        "helius-rpc.com", "helius.xyz", "helius.dev",
+        "quicknode.com", "quiknode.pro",
+        "alchemy.com",
+        "triton.one", "rpcpool.com",
+    ))
+    
+    # Hosts allowed to serve plain-HTTP RPC (a local validator or node)
+    LOCAL_RPC_HOSTS = frozenset(("localhost", "127.0.0.1", "::1"))
+    
+    def __init__(self, max_alerts: int = MAX_ALERT_HISTORY, collect_details: bool = True):
+        # Set collect_details=False for high-volume scanning where only
+        # levels and counts are consumed; alerts then get empty details
+        self.collect_details = collect_details
+        self.alerts: Deque[SecurityAlert] = deque(maxlen=max_alerts)
+        self._by_level: Counter = Counter()  # keyed by ThreatLevel
+        self._severe: Deque[SecurityAlert] = deque()  # CRITICAL/HIGH alerts still in history
         self.scanned_count = 0
     
+    def _record_alerts(self, alerts: Iterable[SecurityAlert]):
+        """Append alerts to history, keeping per-level counts and the severe list in step with evictions."""
+        for alert in alerts:
+            if len(self.alerts) == self.alerts.maxlen:
+                evicted = self.alerts.popleft()
+                self._by_level[evicted.threat_level] -= 1
+                # History is FIFO, so an evicted severe alert is the oldest one
+                if evicted.threat_level in _SEVERE_LEVELS:
+                    self._severe.popleft()
+            self.alerts.append(alert)
+            self._by_level[alert.threat_level] += 1
+            if alert.threat_level in _SEVERE_LEVELS:
+                self._severe.append(alert)
+    
+    def _text_alerts(self, text: str, source: str, alerts: List[SecurityAlert]):
+        """Append alerts for one text to the given list without recording them."""
+        if len(text) <= MAX_CACHED_TEXT_LEN:
+            matches = _match_text(text)
+        elif len(text) <= MAX_SCAN_LEN:
+            matches = _match_text.__wrapped__(text)
+        else:
+            matches = _match_text_windowed(text)
+        
+        for threat_type, detail_key, detail_value in matches:
+            level, description, recommendation = _TEXT_ALERT_TEMPLATES[threat_type]
+            alerts.append(SecurityAlert(
+                threat_type=threat_type,
+                threat_level=level,
+                description=description,
+                details={"source": source, detail_key: detail_value} if self.collect_details else {},
+                recommendation=recommendation
+            ))
+    
     def scan_text(self, text: str, source: str = "unknown") -> List[SecurityAlert]:
         """Scan text for security issues."""
         alerts = []
-        text_lower = text.lower()
-        
-        # Check private keys
-        for pattern in self.PRIVATE_KEY_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                alerts.append(SecurityAlert(
-                    threat_type="EXPOSED_KEY",
-                    threat_level=ThreatLevel.CRITICAL,
-                    description="Potential private key exposed in text",
-                    details={"source": source, "pattern": pattern[:20]},
-                    recommendation="Immediately rotate keys and audit access logs"
-                ))
-                break
-        
-        # Check drainer patterns
-        for pattern in self.DRAINER_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                alerts.append(SecurityAlert(
-                    threat_type="DRAINER_PATTERN",
-                    threat_level=ThreatLevel.CRITICAL,
-                    description="Drainer/approval attack pattern detected",
-                    details={"source": source, "pattern": pattern},
-                    recommendation="Block transaction immediately"
-                ))
-                break
-        
-        # Check phishing patterns
-        for pattern in self.PHISHING_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                alerts.append(SecurityAlert(
-                    threat_type="PHISHING",
-                    threat_level=ThreatLevel.HIGH,
-                    description="Phishing attempt detected",
-                    details={"source": source, "pattern": pattern},
-                    recommendation="Do not interact. Block and report."
-                ))
-                break
-        
-        # Check exfiltration patterns
-        for pattern in self.EXFIL_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                alerts.append(SecurityAlert(
-                    threat_type="EXFILTRATION",
-                    threat_level=ThreatLevel.CRITICAL,
-                    description="Data exfiltration attempt detected",
-                    details={"source": source, "pattern": pattern},
-                    recommendation="Block and audit immediately"
-                ))
-                break
-        
-        # Check suspicious domains
-        for domain in self.SUSPICIOUS_DOMAINS:
-            if domain in text_lower:
-                # Avoid duplicate alerts
-                if not any(a.threat_type in ["PHISHING", "DRAINER_PATTERN"] for a in alerts):
-                    alerts.append(SecurityAlert(
-                        threat_type="SUSPICIOUS_DOMAIN",
-                        threat_level=ThreatLevel.MEDIUM,
-                        description="Suspicious domain pattern detected",
-                        details={"source": source, "domain_pattern": domain},
-                        recommendation="Verify legitimacy before interacting"
-                    ))
-                break
+        self._text_alerts(text, source, alerts)
         
-        self.alerts.extend(alerts)
+        self._record_alerts(alerts)
         self.scanned_count += 1
         return alerts
     
+    def scan_texts(self, texts: Iterable[str], source: str = "batch") -> List[SecurityAlert]:
+        """Scan many texts in one call. Returns all alerts as a flat list."""
+        alerts = []
+        scanned = 0
+        for text in texts:
+            self._text_alerts(text, source, alerts)
+            scanned += 1
+        
+        self._record_alerts(alerts)
+        self.scanned_count += scanned
+        return alerts
+    
     def scan_transaction(self, tx_data: Dict) -> List[SecurityAlert]:
         """Scan transaction for suspicious patterns."""
         alerts = []
@@ -171,7 +202,7 @@ class SecurityScanner:
                     threat_type="LARGE_OUTFLOW",
                     threat_level=ThreatLevel.MEDIUM,
                     description="Large outbound transaction detected",
-                    details={"amount": tx_data.get("amount"), "to": tx_data.get("to")},
+                    details={"amount": tx_data.get("amount"), "to": tx_data.get("to")} if self.collect_details else {},
                     recommendation="Verify this transaction was intended"
                 ))
         
@@ -180,11 +211,11 @@ class SecurityScanner:
                 threat_type="NEW_PROGRAM",
                 threat_level=ThreatLevel.LOW,
                 description="Interaction with newly deployed program",
-                details={"program": tx_data.get("program"), "age_days": tx_data.get("program_age_days")},
+                details={"program": tx_data.get("program"), "age_days": tx_data.get("program_age_days")} if self.collect_details else {},
                 recommendation="New programs carry higher risk. Verify source."
             ))
         
-        self.alerts.extend(alerts)
+        self._record_alerts(alerts)
         return alerts
     
     def scan_rpc_config(self, endpoints: List[str]) -> List[SecurityAlert]:
@@ -192,55 +223,206 @@ class SecurityScanner:
         alerts = []
         
         for endpoint in endpoints:
-            if endpoint.startswith("http://") and "localhost" not in endpoint:
+            if _is_insecure_rpc(endpoint, self.LOCAL_RPC_HOSTS):
                 alerts.append(SecurityAlert(
                     threat_type="INSECURE_RPC",
                     threat_level=ThreatLevel.MEDIUM,
                     description="Non-HTTPS RPC endpoint detected",
-                    details={"endpoint": endpoint},
+                    details={"endpoint": endpoint} if self.collect_details else {},
                     recommendation="Use HTTPS endpoints to prevent MITM attacks"
                 ))
             
-            known_providers = ["solana.com", "helius", "quicknode", "alchemy", "triton"]
-            if not any(p in endpoint.lower() for p in known_providers):
+            if not _is_known_provider(endpoint, self.KNOWN_PROVIDER_DOMAINS):
                 alerts.append(SecurityAlert(
                     threat_type="UNKNOWN_RPC",
                     threat_level=ThreatLevel.LOW,
                     description="Unknown RPC provider",
-                    details={"endpoint": endpoint},
+                    details={"endpoint": endpoint} if self.collect_details else {},
                     recommendation="Verify RPC provider is trustworthy"
                 ))
         
-        self.alerts.extend(alerts)
+        self._record_alerts(alerts)
         return alerts
     
     def get_summary(self) -> Dict:
         """Get security scan summary."""
-        by_level = {}
-        for alert in self.alerts:
-            level = alert.threat_level.value
-            by_level[level] = by_level.get(level, 0) + 1
+        by_level = {level.value: count for level, count in self._by_level.items() if count}
         
         return {
             "total_scans": self.scanned_count,
             "total_alerts": len(self.alerts),
             "by_level": by_level,
-            "critical_count": by_level.get("critical", 0),
-            "high_count": by_level.get("high", 0)
+            "critical_count": self._by_level[ThreatLevel.CRITICAL],
+            "high_count": self._by_level[ThreatLevel.HIGH]
         }
     
     def get_critical_alerts(self) -> List[SecurityAlert]:
         """Get only critical and high alerts."""
-        return [a for a in self.alerts if a.threat_level in (ThreatLevel.CRITICAL, ThreatLevel.HIGH)]
+        return list(self._severe)
+
+
+# Compiled once at import; alerts report the original pattern source
+_PRIVATE_KEY_SET = PatternSet(SecurityScanner.PRIVATE_KEY_PATTERNS, re.IGNORECASE)
+_DRAINER_SET = PatternSet(SecurityScanner.DRAINER_PATTERNS, re.IGNORECASE)
+_PHISHING_SET = PatternSet(SecurityScanner.PHISHING_PATTERNS, re.IGNORECASE)
+_EXFIL_SET = PatternSet(SecurityScanner.EXFIL_PATTERNS, re.IGNORECASE)
+
+
+# Alert metadata per text threat type: (level, description, recommendation)
+_TEXT_ALERT_TEMPLATES = {
+    "EXPOSED_KEY": (
+        ThreatLevel.CRITICAL,
+        "Potential private key exposed in text",
+        "Immediately rotate keys and audit access logs",
+    ),
+    "DRAINER_PATTERN": (
+        ThreatLevel.CRITICAL,
+        "Drainer/approval attack pattern detected",
+        "Block transaction immediately",
+    ),
+    "PHISHING": (
+        ThreatLevel.HIGH,
+        "Phishing attempt detected",
+        "Do not interact. Block and report.",
+    ),
+    "EXFILTRATION": (
+        ThreatLevel.CRITICAL,
+        "Data exfiltration attempt detected",
+        "Block and audit immediately",
+    ),
+    "SUSPICIOUS_DOMAIN": (
+        ThreatLevel.MEDIUM,
+        "Suspicious domain pattern detected",
+        "Verify legitimacy before interacting",
+    ),
+}
+
+
+def _contains_any(text_lower: str, literals: Tuple[str, ...]) -> bool:
+    """Check whether any literal substring occurs in the lowered text."""
+    for literal in literals:
+        if literal in text_lower:
+            return True
+    return False
+
+
+def _endpoint_host(endpoint: str) -> Optional[str]:
+    """Lowercased host of an RPC endpoint (scheme optional); None if unparseable."""
+    try:
+        return urlparse(endpoint if "//" in endpoint else "//" + endpoint).hostname
+    except ValueError:
+        return None
+
+
+def _is_insecure_rpc(endpoint: str, local_hosts: frozenset) -> bool:
+    """Plain-HTTP endpoint whose host is not one of local_hosts."""
+    if endpoint[:7].lower() != "http://":
+        return False
+    return _endpoint_host(endpoint) not in local_hosts
+
+
+def _is_known_provider(endpoint: str, domains: frozenset) -> bool:
+    """Check the endpoint's host and each parent domain against the provider set."""
+    host = _endpoint_host(endpoint)
+    if not host:
+        return False
+    labels = host.split(".")
+    return any(".".join(labels[i:]) in domains for i in range(len(labels) - 1))
+
+
+@lru_cache(maxsize=4096)
+def _match_text(text: str) -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Run the text pattern checks and return (threat_type, detail_key, detail_value)
+    for each category that matched. Pure function of the text, so repeated
+    log lines are served from the cache.
+    """
+    scanner = SecurityScanner
+    matches = []
+    text_lower = text.lower()
+    
+    # Check private keys
+    if len(text) >= scanner.PRIVATE_KEY_MIN_LENGTH or _contains_any(text_lower, scanner.PRIVATE_KEY_LITERALS):
+        pattern = _PRIVATE_KEY_SET.first_match(text)
+        if pattern is not None:
+            matches.append(("EXPOSED_KEY", "pattern", pattern[:20]))
+    
+    # Check drainer patterns
+    if _contains_any(text_lower, scanner.DRAINER_LITERALS):
+        pattern = _DRAINER_SET.first_match(text)
+        if pattern is not None:
+            matches.append(("DRAINER_PATTERN", "pattern", pattern))
+    
+    # Check phishing patterns
+    if _contains_any(text_lower, scanner.PHISHING_LITERALS):
+        pattern = _PHISHING_SET.first_match(text)
+        if pattern is not None:
+            matches.append(("PHISHING", "pattern", pattern))
+    
+    # Check exfiltration patterns
+    if _contains_any(text_lower, scanner.EXFIL_LITERALS):
+        pattern = _EXFIL_SET.first_match(text)
+        if pattern is not None:
+            matches.append(("EXFILTRATION", "pattern", pattern))
+    
+    # Check suspicious domains
+    for domain in scanner.SUSPICIOUS_DOMAINS:
+        if domain in text_lower:
+            # Avoid duplicate alerts
+            if not any(m[0] in ("PHISHING", "DRAINER_PATTERN") for m in matches):
+                matches.append(("SUSPICIOUS_DOMAIN", "domain_pattern", domain))
+            break
+    
+    return tuple(matches)
+
+
+def _scan_windows(text: str) -> Iterator[str]:
+    """
+    Split text into windows of at most MAX_SCAN_LEN that end at a line break.
+    A single line longer than that is kept whole rather than cut mid-line.
+    """
+    start = 0
+    while len(text) - start > MAX_SCAN_LEN:
+        cut = text.rfind("\n", start, start + MAX_SCAN_LEN)
+        if cut == -1:
+            cut = text.find("\n", start + MAX_SCAN_LEN)
+            if cut == -1:
+                break
+        yield text[start:cut + 1]
+        start = cut + 1
+    if start < len(text):
+        yield text[start:]
+
+
+def _match_text_windowed(text: str) -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Scan an oversized text one window of whole lines at a time.
+    Each threat type is reported at most once, in the same order as _match_text.
+    """
+    found: Dict[str, Tuple[str, str, str]] = {}
+    for window in _scan_windows(text):
+        for match in _match_text.__wrapped__(window):
+            found.setdefault(match[0], match)
+    
+    # Keep the duplicate-suppression rule for domains across windows
+    if "PHISHING" in found or "DRAINER_PATTERN" in found:
+        found.pop("SUSPICIOUS_DOMAIN", None)
+    
+    return tuple(found[t] for t in _TEXT_ALERT_TEMPLATES if t in found)
 
 
-_scanner = None
+_scanner: Optional[SecurityScanner] = None
+_scanner_lock = threading.Lock()
 
 def get_security_scanner() -> SecurityScanner:
     global _scanner
-    if _scanner is None:
-        _scanner = SecurityScanner()
-    return _scanner
+    scanner = _scanner
+    if scanner is None:
+        with _scanner_lock:
+            if _scanner is None:
+                _scanner = SecurityScanner()
+            scanner = _scanner
+    return scanner
 
 
 def quick_scan(text: str) -> List[SecurityAlert]:
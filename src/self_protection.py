@@ -12,10 +12,13 @@ Scenarios:
 
 import re
 import time
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Deque, Iterable, List, Dict, Optional
 from enum import Enum
 
+from pattern_matcher import PatternSet
+
 
 class ThreatType(Enum):
     PROMPT_INJECTION = "prompt_injection"
@@ -25,7 +28,7 @@ class ThreatType(Enum):
     SAFE = "safe"
 
 
-@dataclass
+@dataclass(slots=True)
 class SelfProtectionAlert:
     threat_type: ThreatType
     severity: str
@@ -37,7 +40,7 @@ class SelfProtectionAlert:
 class SelfProtection:
     """Protect AgentMedic from attacks."""
     
-    # Prompt injection patterns
+    # Prompt injection patterns (lowercase - matched against lowered input)
     INJECTION_PATTERNS = [
         r'ignore.*previous.*instructions',
         r'forget.*everything',
@@ -52,10 +55,10 @@ class SelfProtection:
         r'bypass.*security',
         r'disable.*protection',
         r'jailbreak',
-        r'DAN.*mode',
+        r'dan.*mode',
     ]
     
-    # Manipulation patterns
+    # Manipulation patterns (lowercase - matched against lowered input)
     MANIPULATION_PATTERNS = [
         r'trust.*me.*completely',
         r'no.*need.*to.*verify',
@@ -66,20 +69,35 @@ class SelfProtection:
         r'root.*privileges',
     ]
     
-    # Resource exhaustion patterns
-    RESOURCE_PATTERNS = [
-        r'.{10000,}',  # Very long strings
-        r'(\w+\s*){1000,}',  # Many repeated words
-    ]
+    # Literal prefilters: each pattern above requires at least one of these
+    # substrings, so the regex pass is skipped when none occur in the input
+    INJECTION_LITERALS = (
+        "ignore", "forget", "now", "instructions", "disregard", "override",
+        "pretend", "act", "bypass", "disable", "jailbreak", "mode",
+    )
+    MANIPULATION_LITERALS = (
+        "completely", "verify", "validation", "required", "override",
+        "access", "privileges",
+    )
+    
+    # Resource exhaustion limits (checked in linear time, no backtracking regex)
+    RESOURCE_MAX_LENGTH = 10000  # Very long strings
+    RESOURCE_MAX_WORDS = 1000  # Many repeated words
     
     def __init__(self, max_input_length: int = 50000):
         self.max_input_length = max_input_length
         self.alerts: List[SelfProtectionAlert] = []
+        self._by_type: Counter = Counter()  # keyed by ThreatType
         self.blocked_count = 0
-        self.request_times: List[float] = []
+        self.request_times: Deque[float] = deque()
         self.rate_limit_window = 60  # seconds
         self.rate_limit_max = 100  # requests per window
     
+    def _record_alert(self, alert: SelfProtectionAlert):
+        """Store an alert and update the per-type counts."""
+        self.alerts.append(alert)
+        self._by_type[alert.threat_type] += 1
+    
     def check_input(self, text: str, source: str = "unknown") -> SelfProtectionAlert:
         """Check input for threats before processing."""
         
@@ -92,39 +110,43 @@ class SelfProtection:
                 blocked=True,
                 details={"length": len(text), "max": self.max_input_length, "source": source}
             )
-            self.alerts.append(alert)
+            self._record_alert(alert)
             self.blocked_count += 1
             return alert
         
         text_lower = text.lower()
         
         # Check for prompt injection
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, text_lower):
-                alert = SelfProtectionAlert(
-                    threat_type=ThreatType.PROMPT_INJECTION,
-                    severity="critical",
-                    description="Prompt injection attempt detected",
-                    blocked=True,
-                    details={"pattern": pattern, "source": source}
-                )
-                self.alerts.append(alert)
-                self.blocked_count += 1
-                return alert
+        pattern = None
+        if any(literal in text_lower for literal in self.INJECTION_LITERALS):
+            pattern = _INJECTION_SET.first_match(text_lower)
+        if pattern is not None:
+            alert = SelfProtectionAlert(
+                threat_type=ThreatType.PROMPT_INJECTION,
+                severity="critical",
+                description="Prompt injection attempt detected",
+                blocked=True,
+                details={"pattern": pattern, "source": source}
+            )
+            self._record_alert(alert)
+            self.blocked_count += 1
+            return alert
         
         # Check for manipulation
-        for pattern in self.MANIPULATION_PATTERNS:
-            if re.search(pattern, text_lower):
-                alert = SelfProtectionAlert(
-                    threat_type=ThreatType.MANIPULATION,
-                    severity="high",
-                    description="Manipulation attempt detected",
-                    blocked=True,
-                    details={"pattern": pattern, "source": source}
-                )
-                self.alerts.append(alert)
-                self.blocked_count += 1
-                return alert
+        pattern = None
+        if any(literal in text_lower for literal in self.MANIPULATION_LITERALS):
+            pattern = _MANIPULATION_SET.first_match(text_lower)
+        if pattern is not None:
+            alert = SelfProtectionAlert(
+                threat_type=ThreatType.MANIPULATION,
+                severity="high",
+                description="Manipulation attempt detected",
+                blocked=True,
+                details={"pattern": pattern, "source": source}
+            )
+            self._record_alert(alert)
+            self.blocked_count += 1
+            return alert
         
         # Safe input
         return SelfProtectionAlert(
@@ -135,49 +157,82 @@ class SelfProtection:
             details={"source": source}
         )
     
+    def check_inputs(self, texts: Iterable[str], source: str = "batch") -> List[SelfProtectionAlert]:
+        """Check many inputs in one call. Returns one alert per input, in order."""
+        check = self.check_input
+        return [check(text, source) for text in texts]
+    
+    def is_resource_heavy(self, text: str) -> bool:
+        """Check for very long or very wordy input without regex backtracking."""
+        if len(text) > self.RESOURCE_MAX_LENGTH:
+            return True
+        
+        words = 0
+        for _ in _WORD_RE.finditer(text):
+            words += 1
+            if words > self.RESOURCE_MAX_WORDS:
+                return True
+        return False
+    
     def check_rate_limit(self) -> bool:
         """Check if rate limit is exceeded."""
         now = time.time()
         
-        # Remove old requests
-        self.request_times = [t for t in self.request_times if now - t < self.rate_limit_window]
+        # Drop requests that have left the window (oldest first)
+        request_times = self.request_times
+        while request_times and now - request_times[0] >= self.rate_limit_window:
+            request_times.popleft()
         
         # Check limit
-        if len(self.request_times) >= self.rate_limit_max:
+        if len(request_times) >= self.rate_limit_max:
             return False
         
-        self.request_times.append(now)
+        request_times.append(now)
         return True
     
     def sanitize_input(self, text: str) -> str:
         """Sanitize input by removing potentially dangerous content."""
-        # Remove null bytes
-        text = text.replace('\x00', '')
-        
-        # Remove control characters (except newlines/tabs)
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+        # Remove null bytes and control characters (except newlines/tabs/CR),
+        # then truncate if too long. Filtering only shrinks the text, so for
+        # long input just enough of the prefix is filtered to fill the limit.
+        limit = self.max_input_length
+        if len(text) <= limit:
+            return _strip_control(text)
         
-        # Truncate if too long
-        if len(text) > self.max_input_length:
-            text = text[:self.max_input_length]
-        
-        return text
+        result = _strip_control(text[:limit])
+        pos = limit
+        while len(result) < limit and pos < len(text):
+            chunk = text[pos:pos + limit - len(result)]
+            result += _strip_control(chunk)
+            pos += len(chunk)
+        return result
     
     def get_stats(self) -> Dict:
         """Get protection statistics."""
-        by_type = {}
-        for alert in self.alerts:
-            t = alert.threat_type.value
-            by_type[t] = by_type.get(t, 0) + 1
-        
         return {
             "total_checks": len(self.alerts),
             "blocked": self.blocked_count,
-            "by_type": by_type,
+            "by_type": {t.value: count for t, count in self._by_type.items()},
             "block_rate": self.blocked_count / max(len(self.alerts), 1)
         }
 
 
+# Compiled once at import. check_input matches against its lowered copy of
+# the text, so these stay case-sensitive (no IGNORECASE casefolding).
+_INJECTION_SET = PatternSet(SelfProtection.INJECTION_PATTERNS)
+_MANIPULATION_SET = PatternSet(SelfProtection.MANIPULATION_PATTERNS)
+_WORD_RE = re.compile(r'\w+')
+# Control characters dropped by sanitize_input
+_CONTROL_BYTES = bytes([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+
+
+def _strip_control(text: str) -> str:
+    # One byte-table pass. Control characters are single UTF-8 bytes and never
+    # occur inside multi-byte sequences, so filtering the encoded bytes is exact.
+    data = text.encode("utf-8", "surrogatepass").translate(None, _CONTROL_BYTES)
+    return data.decode("utf-8", "surrogatepass")
+
+
 _protection = None
 
 def get_self_protection() -> SelfProtection:
@@ -5,12 +5,56 @@ Read-only queries to Solana devnet (and optionally mainnet).
 SAFETY: Never signs transactions, never handles private keys.
 """
 
+import asyncio
+import atexit
 import json
+import os
 import subprocess
+import threading
+import time
+import weakref
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
 
+from rate_limiter import get_concurrency_limiter
+from retry_handler import RetryConfig, retry_on_status
+
+# httpx (optional - pooled keep-alive connections instead of a curl per call)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# orjson (optional - C JSON encoding/decoding of RPC payloads)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# h2 (optional - lets httpx negotiate HTTP/2)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+RPC_TIMEOUT = 30  # seconds
+
+# Async fan-out limits: max in-flight requests, and backoff for HTTP 429
+_RPC_CONCURRENCY = get_concurrency_limiter("solana_rpc", int(os.environ.get("SOLANA_RPC_CONCURRENCY", 8)))
+RATE_LIMIT_RETRY = RetryConfig(max_attempts=4, base_delay=0.5, max_delay=8.0)
+
+MAX_MULTIPLE_ACCOUNTS = 100  # getMultipleAccounts per-request limit
+
+# Short-lived caches for hot read paths, keyed by RPC URL -> (monotonic time, value)
+BLOCKHASH_TTL = 5.0  # seconds
+HEALTH_TTL = 1.0  # seconds
+_blockhash_cache: Dict[str, Tuple[float, str]] = {}
+_health_cache: Dict[str, Tuple[float, "RPCHealth"]] = {}
+
 DEVNET_RPC = "https://api.devnet.solana.com"
 
 # CRITICAL SECURITY: Mainnet write protection
@@ -42,7 +86,7 @@ class TransactionStatus(Enum):
     NOT_FOUND = "not_found"
     PENDING = "pending"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TransactionResult:
     signature: str
     status: TransactionStatus
@@ -51,8 +95,11 @@ class TransactionResult:
     logs: Optional[List[str]] = None
     fee: Optional[int] = None
     block_time: Optional[int] = None
+    account_keys: Optional[List[str]] = None  # Static keys, then v0 lookup-table keys
+    program_ids: Optional[List[str]] = None   # Programs of the top-level instructions
+    num_signers: Optional[int] = None         # Leading account keys that signed (fee payer first)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AccountInfo:
     address: str
     exists: bool
@@ -60,8 +107,9 @@ class AccountInfo:
     owner: Optional[str] = None
     executable: bool = False
     data_len: Optional[int] = None
+    error: Optional[str] = None  # Set when the RPC call failed, so exists=False is unknown
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RPCHealth:
     healthy: bool
     slot: Optional[int] = None
@@ -69,6 +117,102 @@ class RPCHealth:
     error: Optional[str] = None
 
 
+_http_client: Optional["httpx.Client"] = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> "httpx.Client":
+    """Shared client so connections (TCP + TLS) are reused across calls and modules."""
+    global _http_client
+    client = _http_client
+    if client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(**_http_client_options())
+            client = _http_client
+    return client
+
+
+def close_http_client():
+    """Close the shared sync client; a later get_http_client() opens a new one."""
+    global _http_client
+    with _http_client_lock:
+        client, _http_client = _http_client, None
+    if client is not None:
+        client.close()
+
+
+atexit.register(close_http_client)
+
+
+# One async client per event loop - httpx async connections are bound to the
+# loop that opened them, and CLI paths call asyncio.run() repeatedly
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+    weakref.WeakKeyDictionary()
+
+def _get_async_http_client() -> "httpx.AsyncClient":
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(**_http_client_options())
+        _async_http_clients[loop] = client
+    return client
+
+
+def _http_client_options() -> Dict[str, Any]:
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "timeout": RPC_TIMEOUT,
+        "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+    }
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj).encode()
+
+
+def _json_loads(data) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _post_json(rpc_url: str, payload: Any) -> Any:
+    """POST a JSON-RPC payload (single request or batch) and decode the reply."""
+    body = _json_dumps(payload)
+    if HTTPX_AVAILABLE:
+        resp = get_http_client().post(rpc_url, content=body, headers=_JSON_HEADERS)
+        return _json_loads(resp.content)
+    
+    result = subprocess.run(
+        ["curl", "-s", "-X", "POST", rpc_url,
+         "-H", "Content-Type: application/json",
+         "-d", body.decode()],
+        capture_output=True,
+        text=True,
+        timeout=RPC_TIMEOUT
+    )
+    return _json_loads(result.stdout)
+
+
+async def _post_json_async(rpc_url: str, payload: Any) -> Any:
+    """
+    Async _post_json; without httpx the curl path runs in a worker thread.
+    In-flight requests are capped and rate-limited (429) replies are retried
+    with jittered backoff, so fan-out via asyncio.gather stays under provider limits.
+    """
+    async with _RPC_CONCURRENCY:
+        if HTTPX_AVAILABLE:
+            client = _get_async_http_client()
+            body = _json_dumps(payload)
+            resp = await retry_on_status(
+                lambda: client.post(rpc_url, content=body, headers=_JSON_HEADERS),
+                RATE_LIMIT_RETRY
+            )
+            return _json_loads(resp.content)
+        return await asyncio.to_thread(_post_json, rpc_url, payload)
+
+
 def _rpc_call(method: str, params: List[Any], rpc_url: str = DEVNET_RPC) -> Dict:
     """Make a JSON-RPC call to Solana."""
     # Validate mainnet write protection
@@ -82,22 +226,73 @@ def _rpc_call(method: str, params: List[Any], rpc_url: str = DEVNET_RPC) -> Dict
     }
     
     try:
-        result = subprocess.run(
-            ["curl", "-s", "-X", "POST", rpc_url,
-             "-H", "Content-Type: application/json",
-             "-d", json.dumps(payload)],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        return json.loads(result.stdout)
+        return _post_json(rpc_url, payload)
     except Exception as e:
         return {"error": {"message": str(e)}}
 
 
-def check_rpc_health(rpc_url: str = DEVNET_RPC) -> RPCHealth:
-    """Check if Solana RPC is healthy and get current slot."""
-    import time
+async def _rpc_call_async(method: str, params: List[Any], rpc_url: str = DEVNET_RPC) -> Dict:
+    """Make a JSON-RPC call to Solana without blocking the event loop."""
+    _validate_mainnet_write_forbidden(method, rpc_url)
+
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": method,
+        "params": params
+    }
+    
+    try:
+        return await _post_json_async(rpc_url, payload)
+    except Exception as e:
+        return {"error": {"message": str(e)}}
+
+
+def _rpc_batch(calls: List[Tuple[str, List[Any]]], rpc_url: str = DEVNET_RPC) -> List[Dict]:
+    """
+    Make several JSON-RPC calls in one HTTP request.
+    
+    Returns one response per call, in call order. Batch replies may arrive
+    in any order, so they are matched back to their calls by id.
+    """
+    if not calls:
+        return []
+    
+    for method, _ in calls:
+        _validate_mainnet_write_forbidden(method, rpc_url)
+    
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    
+    try:
+        responses = _post_json(rpc_url, payload)
+    except Exception as e:
+        return [{"error": {"message": str(e)}}] * len(calls)
+    
+    # A rejected batch comes back as a single error object
+    if not isinstance(responses, list):
+        error = responses if isinstance(responses, dict) and "error" in responses \
+            else {"error": {"message": "Invalid batch response"}}
+        return [error] * len(calls)
+    
+    by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+    missing = {"error": {"message": "No response for batched call"}}
+    return [by_id.get(i, missing) for i in range(len(calls))]
+
+
+def check_rpc_health(rpc_url: str = DEVNET_RPC, max_age: float = HEALTH_TTL) -> RPCHealth:
+    """
+    Check if Solana RPC is healthy and get current slot.
+    
+    A healthy result younger than max_age seconds is reused; pass
+    max_age=0 to force a fresh check. Failures are never cached.
+    """
+    cached = _health_cache.get(rpc_url)
+    if cached is not None and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+    
     start = time.time()
     
     response = _rpc_call("getSlot", [], rpc_url)
@@ -109,21 +304,20 @@ def check_rpc_health(rpc_url: str = DEVNET_RPC) -> RPCHealth:
             error=response["error"].get("message", "Unknown error")
         )
     
-    return RPCHealth(
+    health = RPCHealth(
         healthy=True,
         slot=response.get("result"),
         latency_ms=round(latency, 2)
     )
+    _health_cache[rpc_url] = (time.monotonic(), health)
+    return health
 
 
-def get_transaction(signature: str, rpc_url: str = DEVNET_RPC) -> TransactionResult:
-    """Get transaction details by signature."""
-    response = _rpc_call(
-        "getTransaction",
-        [signature, {"encoding": "json", "maxSupportedTransactionVersion": 0}],
-        rpc_url
-    )
-    
+def _transaction_request(signature: str) -> Tuple[str, List[Any]]:
+    return ("getTransaction", [signature, {"encoding": "json", "maxSupportedTransactionVersion": 0}])
+
+
+def _parse_transaction(signature: str, response: Dict) -> TransactionResult:
     if "error" in response:
         return TransactionResult(
             signature=signature,
@@ -138,9 +332,22 @@ def get_transaction(signature: str, rpc_url: str = DEVNET_RPC) -> TransactionRes
             status=TransactionStatus.NOT_FOUND
         )
     
-    meta = result.get("meta", {})
+    meta = result.get("meta") or {}
     err = meta.get("err")
     
+    message = (result.get("transaction") or {}).get("message") or {}
+    loaded = meta.get("loadedAddresses") or {}
+    account_keys = (
+        list(message.get("accountKeys", []))
+        + loaded.get("writable", [])
+        + loaded.get("readonly", [])
+    )
+    program_ids = [
+        account_keys[ix["programIdIndex"]]
+        for ix in message.get("instructions", [])
+        if ix.get("programIdIndex", len(account_keys)) < len(account_keys)
+    ]
+    
     return TransactionResult(
         signature=signature,
         status=TransactionStatus.FAILED if err else TransactionStatus.SUCCESS,
@@ -148,43 +355,113 @@ def get_transaction(signature: str, rpc_url: str = DEVNET_RPC) -> TransactionRes
         error=str(err) if err else None,
         logs=meta.get("logMessages", []),
         fee=meta.get("fee"),
-        block_time=result.get("blockTime")
+        block_time=result.get("blockTime"),
+        account_keys=account_keys,
+        program_ids=program_ids,
+        num_signers=(message.get("header") or {}).get("numRequiredSignatures")
     )
 
 
-def get_account_info(address: str, rpc_url: str = DEVNET_RPC) -> AccountInfo:
-    """Get account information."""
-    response = _rpc_call(
-        "getAccountInfo",
-        [address, {"encoding": "base64"}],
-        rpc_url
-    )
-    
-    if "error" in response:
-        return AccountInfo(address=address, exists=False)
-    
-    result = response.get("result", {}).get("value")
-    if result is None:
+def get_transaction(signature: str, rpc_url: str = DEVNET_RPC) -> TransactionResult:
+    """Get transaction details by signature."""
+    method, params = _transaction_request(signature)
+    return _parse_transaction(signature, _rpc_call(method, params, rpc_url))
+
+
+def get_transactions(signatures: List[str], rpc_url: str = DEVNET_RPC) -> List[TransactionResult]:
+    """Get details for several transactions in one batched request."""
+    responses = _rpc_batch([_transaction_request(sig) for sig in signatures], rpc_url)
+    return [_parse_transaction(sig, resp) for sig, resp in zip(signatures, responses)]
+
+
+def _parse_account(address: str, value: Optional[Dict]) -> AccountInfo:
+    if value is None:
         return AccountInfo(address=address, exists=False)
     
     return AccountInfo(
         address=address,
         exists=True,
-        lamports=result.get("lamports"),
-        owner=result.get("owner"),
-        executable=result.get("executable", False),
-        data_len=len(result.get("data", [""])[0]) if result.get("data") else 0
+        lamports=value.get("lamports"),
+        owner=value.get("owner"),
+        executable=value.get("executable", False),
+        data_len=len(value.get("data", [""])[0]) if value.get("data") else 0
+    )
+
+
+def _account_info_request(address: str) -> Tuple[str, List[Any]]:
+    return ("getAccountInfo", [address, {"encoding": "base64"}])
+
+
+def _parse_account_response(address: str, response: Dict) -> AccountInfo:
+    if "error" in response:
+        return AccountInfo(address=address, exists=False, error=str(response["error"]))
+    
+    return _parse_account(address, response.get("result", {}).get("value"))
+
+
+def get_account_info(address: str, rpc_url: str = DEVNET_RPC) -> AccountInfo:
+    """Get account information."""
+    method, params = _account_info_request(address)
+    return _parse_account_response(address, _rpc_call(method, params, rpc_url))
+
+
+def get_accounts_info(addresses: List[str], rpc_url: str = DEVNET_RPC) -> List[AccountInfo]:
+    """Get information for several accounts via getMultipleAccounts."""
+    chunks = [
+        addresses[i:i + MAX_MULTIPLE_ACCOUNTS]
+        for i in range(0, len(addresses), MAX_MULTIPLE_ACCOUNTS)
+    ]
+    responses = _rpc_batch(
+        [("getMultipleAccounts", [chunk, {"encoding": "base64"}]) for chunk in chunks],
+        rpc_url
     )
+    
+    accounts = []
+    for chunk, response in zip(chunks, responses):
+        if "error" in response:
+            error = str(response["error"])
+            accounts.extend(AccountInfo(address=addr, exists=False, error=error) for addr in chunk)
+            continue
+        values = response.get("result", {}).get("value")
+        if values is None:
+            values = [None] * len(chunk)
+        accounts.extend(_parse_account(addr, value) for addr, value in zip(chunk, values))
+    return accounts
 
 
-def get_recent_blockhash(rpc_url: str = DEVNET_RPC) -> Optional[str]:
-    """Get recent blockhash (useful for checking RPC responsiveness)."""
+def _fetch_blockhash(rpc_url: str) -> Optional[str]:
     response = _rpc_call("getLatestBlockhash", [], rpc_url)
     
     if "error" in response:
         return None
     
-    return response.get("result", {}).get("value", {}).get("blockhash")
+    blockhash = response.get("result", {}).get("value", {}).get("blockhash")
+    if blockhash:
+        _blockhash_cache[rpc_url] = (time.monotonic(), blockhash)
+    return blockhash
+
+
+def get_recent_blockhash(rpc_url: str = DEVNET_RPC, max_age: float = BLOCKHASH_TTL) -> Optional[str]:
+    """
+    Get recent blockhash (useful for checking RPC responsiveness).
+    
+    Served from cache when fetched less than max_age seconds ago; a
+    blockhash stays valid for about two minutes, so this is safe.
+    """
+    cached = _blockhash_cache.get(rpc_url)
+    if cached is not None and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+    return _fetch_blockhash(rpc_url)
+
+
+async def start_blockhash_updater(rpc_url: str = DEVNET_RPC, interval: float = BLOCKHASH_TTL):
+    """
+    Keep the cached blockhash fresh so get_recent_blockhash never waits on RPC.
+    Run as a background task: asyncio.create_task(start_blockhash_updater()).
+    """
+    while True:
+        await asyncio.to_thread(_fetch_blockhash, rpc_url)
+        await asyncio.sleep(interval)
 
 
 def get_signatures_for_address(
@@ -198,7 +475,10 @@ def get_signatures_for_address(
         [address, {"limit": limit}],
         rpc_url
     )
-    
+    return _parse_signatures(response)
+
+
+def _parse_signatures(response: Dict) -> List[Dict]:
     if "error" in response:
         return []
     
@@ -211,6 +491,35 @@ def check_program_exists(program_id: str, rpc_url: str = DEVNET_RPC) -> bool:
     return info.exists and info.executable
 
 
+# Async variants - for use from an event loop, e.g. with asyncio.gather()
+# to overlap several lookups
+
+async def get_transaction_async(signature: str, rpc_url: str = DEVNET_RPC) -> TransactionResult:
+    """Async get_transaction."""
+    method, params = _transaction_request(signature)
+    return _parse_transaction(signature, await _rpc_call_async(method, params, rpc_url))
+
+
+async def get_account_info_async(address: str, rpc_url: str = DEVNET_RPC) -> AccountInfo:
+    """Async get_account_info."""
+    method, params = _account_info_request(address)
+    return _parse_account_response(address, await _rpc_call_async(method, params, rpc_url))
+
+
+async def get_signatures_for_address_async(
+    address: str,
+    limit: int = 10,
+    rpc_url: str = DEVNET_RPC
+) -> List[Dict]:
+    """Async get_signatures_for_address."""
+    response = await _rpc_call_async(
+        "getSignaturesForAddress",
+        [address, {"limit": limit}],
+        rpc_url
+    )
+    return _parse_signatures(response)
+
+
 # Convenience aliases
 def devnet_health() -> RPCHealth:
     return check_rpc_health(DEVNET_RPC)
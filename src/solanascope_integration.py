@@ -10,15 +10,44 @@ API: https://solanascope.vercel.app
 Credit: clawdbot-prime (Colosseum Hackathon)
 """
 
+import asyncio
 import json
+import os
+import weakref
 import httpx
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
 
+# orjson (optional - faster decoding of API responses)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# h2 (optional - lets httpx multiplex requests over HTTP/2)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from rate_limiter import get_concurrency_limiter
+from retry_handler import RetryConfig, retry_on_status
+
 
 SOLANASCOPE_BASE = "https://solanascope.vercel.app"
 
+# Max in-flight API requests, and backoff for HTTP 429 replies
+_SCOPE_CONCURRENCY = get_concurrency_limiter("solanascope", int(os.environ.get("SOLANASCOPE_CONCURRENCY", 8)))
+RATE_LIMIT_RETRY = RetryConfig(max_attempts=4, base_delay=0.5, max_delay=8.0)
+
+
+def _decode(resp: httpx.Response) -> Any:
+    """Decode a JSON response body, with orjson when installed."""
+    return orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
+
 
 class RiskLevel(Enum):
     LOW = "low"
@@ -27,7 +56,7 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnomalyResult:
     """Result from SolanaScope anomaly detection."""
     address: str
@@ -49,7 +78,7 @@ class AnomalyResult:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceData:
     """Price data from Pyth oracle via SolanaScope."""
     pair: str
@@ -80,24 +109,68 @@ class SolanaScope:
     def __init__(self, base_url: str = SOLANASCOPE_BASE, timeout: float = 10.0):
         self.base_url = base_url
         self.timeout = timeout
-        self._client = None
+        # One client per event loop: connections are bound to the loop that
+        # opened them, and a client goes away with its loop after asyncio.run()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        # Conditional GET state per path: last ETag and its decoded body
+        self._etag: Dict[str, str] = {}
+        self._cached_body: Dict[str, Any] = {}
     
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
-        return self._client
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Keep idle connections past the 10-30s polling interval so polls
+            # reuse the TLS session instead of renegotiating each time
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60)
+            )
+            self._clients[loop] = client
+        return client
+    
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request under the concurrency cap, backing off on 429."""
+        client = await self._get_client()
+        async with _SCOPE_CONCURRENCY:
+            return await retry_on_status(
+                lambda: client.request(method, f"{self.base_url}{path}", **kwargs),
+                RATE_LIMIT_RETRY
+            )
+    
+    async def _get_conditional(self, path: str) -> Optional[Any]:
+        """
+        GET with If-None-Match; a 304 reuses the body cached for that ETag.
+        
+        Returns the decoded body, or None for any other status.
+        """
+        etag = self._etag.get(path)
+        headers = {"If-None-Match": etag} if etag else None
+        resp = await self._request("GET", path, headers=headers)
+        if resp.status_code == 304 and path in self._cached_body:
+            return self._cached_body[path]
+        if resp.status_code != 200:
+            return None
+        data = _decode(resp)
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._etag[path] = etag
+            self._cached_body[path] = data
+        return data
     
     async def close(self):
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Close the client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
     
     async def health_check(self) -> bool:
         """Check if SolanaScope API is available."""
         try:
-            client = await self._get_client()
-            resp = await client.get(f"{self.base_url}/health")
-            data = resp.json()
+            resp = await self._request("GET", "/health")
+            data = _decode(resp)
             return data.get("status") == "healthy"
         except Exception as e:
             print(f"[SolanaScope] Health check failed: {e}")
@@ -113,13 +186,13 @@ class SolanaScope:
         - Burst activity → possible bot/attack pattern
         """
         try:
-            client = await self._get_client()
-            resp = await client.post(
-                f"{self.base_url}/detect/anomaly",
+            resp = await self._request(
+                "POST",
+                "/detect/anomaly",
                 json={"address": wallet_address}
             )
             if resp.status_code == 200:
-                return AnomalyResult.from_api(resp.json())
+                return AnomalyResult.from_api(_decode(resp))
             return None
         except Exception as e:
             print(f"[SolanaScope] Anomaly detection failed: {e}")
@@ -134,12 +207,11 @@ class SolanaScope:
         - Low confidence → may explain failed swaps
         """
         try:
-            client = await self._get_client()
             # URL encode the pair (SOL/USD -> SOL%2FUSD)
             encoded_pair = pair.replace("/", "%2F")
-            resp = await client.get(f"{self.base_url}/price/{encoded_pair}")
-            if resp.status_code == 200:
-                return PriceData.from_api(resp.json())
+            data = await self._get_conditional(f"/price/{encoded_pair}")
+            if data is not None:
+                return PriceData.from_api(data)
             return None
         except Exception as e:
             print(f"[SolanaScope] Price fetch failed: {e}")
@@ -148,10 +220,8 @@ class SolanaScope:
     async def get_wallet_balance(self, address: str) -> Optional[float]:
         """Get wallet SOL balance."""
         try:
-            client = await self._get_client()
-            resp = await client.get(f"{self.base_url}/wallet/{address}/balance")
-            if resp.status_code == 200:
-                data = resp.json()
+            data = await self._get_conditional(f"/wallet/{address}/balance")
+            if data is not None:
                 return data.get("solBalance", 0)
             return None
         except Exception as e:
@@ -159,6 +229,24 @@ class SolanaScope:
             return None
 
 
+_scope: Optional[SolanaScope] = None
+
+def get_scope() -> SolanaScope:
+    """Shared client, so diagnostic calls reuse warm connections."""
+    global _scope
+    if _scope is None:
+        _scope = SolanaScope()
+    return _scope
+
+
+async def close_scope():
+    """Close the shared client; call once from the event loop that used it."""
+    global _scope
+    if _scope is not None:
+        scope, _scope = _scope, None
+        await scope.close()
+
+
 # AgentMedic integration functions
 
 async def diagnose_counterparty(wallet_address: str) -> Dict[str, Any]:
@@ -170,7 +258,7 @@ async def diagnose_counterparty(wallet_address: str) -> Dict[str, Any]:
     
     Returns diagnostic info for the agent's incident report.
     """
-    scope = SolanaScope()
+    scope = get_scope()
     result = {
         "wallet": wallet_address,
         "checked": False,
@@ -178,27 +266,23 @@ async def diagnose_counterparty(wallet_address: str) -> Dict[str, Any]:
         "recommendation": "unable to analyze"
     }
     
-    try:
-        anomaly = await scope.detect_anomaly(wallet_address)
-        if anomaly:
-            result["checked"] = True
-            result["risk_level"] = anomaly.overall_risk.value
-            result["anomaly_count"] = anomaly.anomaly_count
-            result["sol_balance"] = anomaly.sol_balance
-            result["anomalies"] = anomaly.anomalies
-            
-            # Generate recommendation based on risk
-            if anomaly.overall_risk == RiskLevel.CRITICAL:
-                result["recommendation"] = "AVOID - Critical risk detected, recommend blacklist"
-            elif anomaly.overall_risk == RiskLevel.HIGH:
-                result["recommendation"] = "CAUTION - High risk, recommend manual review"
-            elif anomaly.overall_risk == RiskLevel.MEDIUM:
-                result["recommendation"] = "MONITOR - Medium risk, proceed with caution"
-            else:
-                result["recommendation"] = "OK - Low risk, normal activity"
-    
-    finally:
-        await scope.close()
+    anomaly = await scope.detect_anomaly(wallet_address)
+    if anomaly:
+        result["checked"] = True
+        result["risk_level"] = anomaly.overall_risk.value
+        result["anomaly_count"] = anomaly.anomaly_count
+        result["sol_balance"] = anomaly.sol_balance
+        result["anomalies"] = anomaly.anomalies
+        
+        # Generate recommendation based on risk
+        if anomaly.overall_risk == RiskLevel.CRITICAL:
+            result["recommendation"] = "AVOID - Critical risk detected, recommend blacklist"
+        elif anomaly.overall_risk == RiskLevel.HIGH:
+            result["recommendation"] = "CAUTION - High risk, recommend manual review"
+        elif anomaly.overall_risk == RiskLevel.MEDIUM:
+            result["recommendation"] = "MONITOR - Medium risk, proceed with caution"
+        else:
+            result["recommendation"] = "OK - Low risk, normal activity"
     
     return result
 
@@ -210,7 +294,7 @@ async def check_price_reliability(pair: str = "SOL/USD") -> Dict[str, Any]:
     Called by AgentMedic to diagnose if a failed swap was due
     to unreliable price data.
     """
-    scope = SolanaScope()
+    scope = get_scope()
     result = {
         "pair": pair,
         "checked": False,
@@ -218,32 +302,28 @@ async def check_price_reliability(pair: str = "SOL/USD") -> Dict[str, Any]:
         "recommendation": "unable to check"
     }
     
-    try:
-        price = await scope.get_price(pair)
-        if price:
-            result["checked"] = True
-            result["price"] = price.price
-            result["confidence"] = price.confidence
-            result["confidence_pct"] = price.confidence_pct
-            
-            # Parse confidence percentage
-            conf_pct = float(price.confidence_pct.replace("%", ""))
-            
-            if conf_pct < 0.5:
-                result["reliable"] = True
-                result["recommendation"] = "Price data highly reliable"
-            elif conf_pct < 1.0:
-                result["reliable"] = True
-                result["recommendation"] = "Price data reliable, normal confidence"
-            elif conf_pct < 2.0:
-                result["reliable"] = False
-                result["recommendation"] = "Price data uncertain, consider waiting"
-            else:
-                result["reliable"] = False
-                result["recommendation"] = "Price data unreliable, recommend delay"
-    
-    finally:
-        await scope.close()
+    price = await scope.get_price(pair)
+    if price:
+        result["checked"] = True
+        result["price"] = price.price
+        result["confidence"] = price.confidence
+        result["confidence_pct"] = price.confidence_pct
+        
+        # Parse confidence percentage
+        conf_pct = float(price.confidence_pct.replace("%", ""))
+        
+        if conf_pct < 0.5:
+            result["reliable"] = True
+            result["recommendation"] = "Price data highly reliable"
+        elif conf_pct < 1.0:
+            result["reliable"] = True
+            result["recommendation"] = "Price data reliable, normal confidence"
+        elif conf_pct < 2.0:
+            result["reliable"] = False
+            result["recommendation"] = "Price data uncertain, consider waiting"
+        else:
+            result["reliable"] = False
+            result["recommendation"] = "Price data unreliable, recommend delay"
     
     return result
 
@@ -259,27 +339,29 @@ async def demo():
     test_wallet = "DYw8jCTfwHNRJhhmFcbXvVDTqWMEVFBX6ZKUmG5CNSKK"
     
     print(f"\n[1] Checking counterparty wallet: {test_wallet[:20]}...")
-    diagnosis = await diagnose_counterparty(test_wallet)
-    print(f"    Risk Level: {diagnosis['risk_level']}")
-    print(f"    Recommendation: {diagnosis['recommendation']}")
-    if diagnosis.get('anomalies'):
-        print(f"    Anomalies found: {len(diagnosis['anomalies'])}")
-        for a in diagnosis['anomalies']:
-            print(f"      - {a['type']}: {a['description']}")
-    
-    print(f"\n[2] Checking SOL/USD price reliability...")
-    price_check = await check_price_reliability("SOL/USD")
-    if price_check['checked']:
-        print(f"    Price: ${price_check['price']:.2f}")
-        print(f"    Confidence: {price_check['confidence_pct']}")
-        print(f"    Reliable: {price_check['reliable']}")
-        print(f"    Recommendation: {price_check['recommendation']}")
-    
-    print("\n" + "=" * 60)
-    print("Integration demo complete!")
-    print("=" * 60)
+    try:
+        diagnosis = await diagnose_counterparty(test_wallet)
+        print(f"    Risk Level: {diagnosis['risk_level']}")
+        print(f"    Recommendation: {diagnosis['recommendation']}")
+        if diagnosis.get('anomalies'):
+            print(f"    Anomalies found: {len(diagnosis['anomalies'])}")
+            for a in diagnosis['anomalies']:
+                print(f"      - {a['type']}: {a['description']}")
+        
+        print(f"\n[2] Checking SOL/USD price reliability...")
+        price_check = await check_price_reliability("SOL/USD")
+        if price_check['checked']:
+            print(f"    Price: ${price_check['price']:.2f}")
+            print(f"    Confidence: {price_check['confidence_pct']}")
+            print(f"    Reliable: {price_check['reliable']}")
+            print(f"    Recommendation: {price_check['recommendation']}")
+        
+        print("\n" + "=" * 60)
+        print("Integration demo complete!")
+        print("=" * 60)
+    finally:
+        await close_scope()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(demo())
@@ -4,10 +4,14 @@ AgentMedic State Machine
 Finite state machine for agent lifecycle.
 """
 
+import logging
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Callable
+from typing import Deque, Dict, FrozenSet, List, Optional, Callable
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class AgentState(Enum):
     UNKNOWN = "unknown"
@@ -19,14 +23,17 @@ class AgentState(Enum):
     STOPPED = "stopped"
 
 
-VALID_TRANSITIONS = {
-    AgentState.UNKNOWN: [AgentState.STARTING, AgentState.HEALTHY, AgentState.FAILED],
-    AgentState.STARTING: [AgentState.HEALTHY, AgentState.FAILED],
-    AgentState.HEALTHY: [AgentState.DEGRADED, AgentState.FAILED, AgentState.STOPPED],
-    AgentState.DEGRADED: [AgentState.HEALTHY, AgentState.RECOVERING, AgentState.FAILED],
-    AgentState.RECOVERING: [AgentState.HEALTHY, AgentState.DEGRADED, AgentState.FAILED],
-    AgentState.FAILED: [AgentState.RECOVERING, AgentState.STOPPED],
-    AgentState.STOPPED: [AgentState.STARTING],
+# Transition history kept per machine
+MAX_HISTORY = 1024
+
+VALID_TRANSITIONS: Dict[AgentState, FrozenSet[AgentState]] = {
+    AgentState.UNKNOWN: frozenset({AgentState.STARTING, AgentState.HEALTHY, AgentState.FAILED}),
+    AgentState.STARTING: frozenset({AgentState.HEALTHY, AgentState.FAILED}),
+    AgentState.HEALTHY: frozenset({AgentState.DEGRADED, AgentState.FAILED, AgentState.STOPPED}),
+    AgentState.DEGRADED: frozenset({AgentState.HEALTHY, AgentState.RECOVERING, AgentState.FAILED}),
+    AgentState.RECOVERING: frozenset({AgentState.HEALTHY, AgentState.DEGRADED, AgentState.FAILED}),
+    AgentState.FAILED: frozenset({AgentState.RECOVERING, AgentState.STOPPED}),
+    AgentState.STOPPED: frozenset({AgentState.STARTING}),
 }
 
 
@@ -36,32 +43,40 @@ class StateMachine:
     def __init__(self, agent_id: str):
         self.agent_id = agent_id
         self.state = AgentState.UNKNOWN
-        self.history: List[tuple] = []
+        self.history: Deque[tuple] = deque(maxlen=MAX_HISTORY)
         self._callbacks: Dict[AgentState, List[Callable]] = {}
     
     def can_transition(self, new_state: AgentState) -> bool:
-        return new_state in VALID_TRANSITIONS.get(self.state, [])
+        return new_state in VALID_TRANSITIONS[self.state]
     
     def transition(self, new_state: AgentState) -> bool:
-        if not self.can_transition(new_state):
+        if new_state not in VALID_TRANSITIONS[self.state]:
             return False
         
         old_state = self.state
         self.state = new_state
         self.history.append((old_state, new_state))
         
-        for cb in self._callbacks.get(new_state, []):
-            try:
-                cb(self.agent_id, old_state, new_state)
-            except:
-                pass
+        for cb in self._callbacks.get(new_state, ()):
+            cb(self.agent_id, old_state, new_state)
         
         return True
     
     def on_enter(self, state: AgentState, callback: Callable):
         if state not in self._callbacks:
             self._callbacks[state] = []
-        self._callbacks[state].append(callback)
+        self._callbacks[state].append(_guarded(callback))
+
+
+def _guarded(callback: Callable) -> Callable:
+    """Wrap a state callback so a failure is logged instead of breaking the transition."""
+    def run(agent_id: str, old_state: AgentState, new_state: AgentState):
+        try:
+            callback(agent_id, old_state, new_state)
+        except Exception:
+            logger.exception("State callback %r failed for %s (%s -> %s)",
+                             callback, agent_id, old_state.value, new_state.value)
+    return run
 
 
 _machines: Dict[str, StateMachine] = {}
@@ -5,62 +5,91 @@ Generate status reports for external consumption.
 """
 
 import json
+import time
 from datetime import datetime, timezone
 from typing import Dict, Any
 
+# orjson (optional - faster JSON encoding)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Markdown report, formatted directly from raw values (see to_markdown)
+_MD_TEMPLATE = """# {agent} Status Report
+
+**Status:** {status}  
+**Timestamp:** {timestamp}  
+**Uptime:** {uptime}s  
+
+## Modules
+| Module | Status |
+|--------|--------|
+{module_rows}
+""".format
+
 
 class StatusReporter:
     """Generate status reports in various formats."""
     
+    STATUS = "healthy"
+    VERSION = "1.0.0"
+    MODULES = {
+        "observer": True,
+        "diagnoser": True,
+        "recoverer": True,
+        "verifier": True
+    }
+    
     def __init__(self, agent_name: str = "AgentMedic"):
         self.agent_name = agent_name
         self.start_time = datetime.now(timezone.utc)
+        self._start_monotonic = time.monotonic()
+        # Module statuses are fixed, so their table rows are rendered once
+        self._module_rows = "\n".join(
+            f"| {name.capitalize()} | {'✅' if ok else '❌'} |"
+            for name, ok in self.MODULES.items()
+        )
+    
+    def _uptime_seconds(self) -> int:
+        return int(time.monotonic() - self._start_monotonic)
+    
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.fromtimestamp(time.time(), timezone.utc).isoformat()
     
     def get_status(self) -> Dict[str, Any]:
         """Get current status as dict."""
-        now = datetime.now(timezone.utc)
-        uptime_seconds = (now - self.start_time).total_seconds()
-        
         return {
             "agent": self.agent_name,
-            "status": "healthy",
-            "timestamp": now.isoformat(),
-            "uptime_seconds": int(uptime_seconds),
-            "version": "1.0.0",
-            "modules": {
-                "observer": True,
-                "diagnoser": True,
-                "recoverer": True,
-                "verifier": True
-            }
+            "status": self.STATUS,
+            "timestamp": self._timestamp(),
+            "uptime_seconds": self._uptime_seconds(),
+            "version": self.VERSION,
+            "modules": dict(self.MODULES)
         }
     
     def to_json(self) -> str:
         """Get status as JSON string."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.get_status(), option=orjson.OPT_INDENT_2).decode()
         return json.dumps(self.get_status(), indent=2)
     
     def to_markdown(self) -> str:
         """Get status as markdown."""
-        s = self.get_status()
-        return f"""# {s['agent']} Status Report
-
-**Status:** {s['status']}  
-**Timestamp:** {s['timestamp']}  
-**Uptime:** {s['uptime_seconds']}s  
-
-## Modules
-| Module | Status |
-|--------|--------|
-| Observer | {'✅' if s['modules']['observer'] else '❌'} |
-| Diagnoser | {'✅' if s['modules']['diagnoser'] else '❌'} |
-| Recoverer | {'✅' if s['modules']['recoverer'] else '❌'} |
-| Verifier | {'✅' if s['modules']['verifier'] else '❌'} |
-"""
+        return _MD_TEMPLATE(
+            agent=self.agent_name,
+            status=self.STATUS,
+            timestamp=self._timestamp(),
+            uptime=self._uptime_seconds(),
+            module_rows=self._module_rows
+        )
     
     def to_oneline(self) -> str:
         """Get one-line status."""
-        s = self.get_status()
-        return f"[{s['agent']}] {s['status'].upper()} | uptime: {s['uptime_seconds']}s"
+        return f"[{self.agent_name}] {self.STATUS.upper()} | uptime: {self._uptime_seconds()}s"
 
 
 if __name__ == "__main__":
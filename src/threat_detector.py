@@ -10,15 +10,66 @@ Inspired by BlockScoreBot's feedback on the forum.
 SAFETY: Read-only, never signs transactions, never handles funds.
 """
 
+import asyncio
 import json
+import mmap
+import os
+import re
+import tempfile
+import time
+from itertools import islice
 from dataclasses import dataclass
-from typing import List, Set, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Set, Optional, Dict, Any, Tuple, Callable
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 
 import solana_rpc
 
+PUBKEY_LEN = 32
+# Base58 length range of a 32-byte key; anything outside it is never decoded
+PUBKEY_B58_MIN, PUBKEY_B58_MAX = 32, 44
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {ch: i for i, ch in enumerate(_B58_ALPHABET)}
+# "Program <id> invoke [N]" lines in transaction logs, including CPIs
+_PROGRAM_INVOKE_RE = re.compile(r"Program (\S+) invoke")
+
+# Native/SPL programs and sysvars that nearly every transaction touches. Their
+# own traffic says nothing about an incident (the System Program alone would
+# trip the drain heuristic), so they are never assessed as counterparties
+WELL_KNOWN_ADDRESSES = frozenset({
+    "11111111111111111111111111111111",               # System Program
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",    # SPL Token
+    "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb",    # SPL Token-2022
+    "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL",   # Associated Token Account
+    "ComputeBudget111111111111111111111111111111",    # Compute Budget
+    "MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr",    # Memo
+    "Memo1UhkJRfHyvLMcVucJwxXeuD728EqVDDwQDxFMNo",    # Memo (v1)
+    "AddressLookupTab1e1111111111111111111111111",    # Address Lookup Table
+    "Vote111111111111111111111111111111111111111",    # Vote
+    "Stake11111111111111111111111111111111111111",    # Stake
+    "Config1111111111111111111111111111111111111",    # Config
+    "BPFLoader2111111111111111111111111111111111",    # BPF Loader
+    "BPFLoaderUpgradeab1e11111111111111111111111",    # Upgradeable BPF Loader
+    "Ed25519SigVerify111111111111111111111111111",    # Ed25519 precompile
+    "KeccakSecp256k11111111111111111111111111111",    # Secp256k1 precompile
+    "SysvarC1ock11111111111111111111111111111111",    # Clock sysvar
+    "SysvarRent111111111111111111111111111111111",    # Rent sysvar
+    "Sysvar1nstructions1111111111111111111111111",    # Instructions sysvar
+    "SysvarRecentB1ockHashes11111111111111111111",    # Recent blockhashes sysvar
+})
+
+# check_address verdicts (including "clean") are reused for this long
+ADDRESS_CACHE_TTL = 60.0  # seconds
+MAX_ADDRESS_CACHE = 10_000
+
+# Drain heuristic: more than DRAIN_THRESHOLD successful txs among the last DRAIN_WINDOW
+DRAIN_WINDOW = 10
+DRAIN_THRESHOLD = 5
+
+# Blacklist additions are logged, then folded into the JSON file this often
+BLACKLIST_COMPACT_EVERY = 100
+
 
 class ThreatType(Enum):
     KNOWN_SCAM = "known_scam"
@@ -29,7 +80,7 @@ class ThreatType(Enum):
     CLEAN = "clean"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ThreatAssessment:
     """Assessment of an address or transaction."""
     address: str
@@ -40,6 +91,116 @@ class ThreatAssessment:
     timestamp: str
 
 
+def _b58decode(text: str) -> Optional[bytes]:
+    """Decode base58; None if text is not valid base58."""
+    num = 0
+    for ch in text:
+        digit = _B58_INDEX.get(ch)
+        if digit is None:
+            return None
+        num = num * 58 + digit
+    pad = len(text) - len(text.lstrip("1"))
+    return b"\0" * pad + num.to_bytes((num.bit_length() + 7) // 8, "big")
+
+
+def _b58encode(data: bytes) -> str:
+    num = int.from_bytes(data, "big")
+    chars = []
+    while num:
+        num, rem = divmod(num, 58)
+        chars.append(_B58_ALPHABET[rem])
+    pad = len(data) - len(data.lstrip(b"\0"))
+    return "1" * pad + "".join(reversed(chars))
+
+
+def involved_addresses(tx_results: Iterable["solana_rpc.TransactionResult"]) -> List[str]:
+    """
+    Accounts the transactions touched, as candidates for threat checks.
+    
+    Taken from each transaction's account keys. Left out are the signers
+    (the agent's own wallets; the fee payer at least), programs (top-level
+    and invoked via CPI, per the logs) and WELL_KNOWN_ADDRESSES.
+    """
+    accounts: Set[str] = set()
+    excluded: Set[str] = set(WELL_KNOWN_ADDRESSES)
+    for tx_result in tx_results:
+        if tx_result.account_keys:
+            signers = max(tx_result.num_signers or 1, 1)
+            accounts.update(tx_result.account_keys[signers:])
+            excluded.update(tx_result.account_keys[:signers])
+        if tx_result.program_ids:
+            excluded.update(tx_result.program_ids)
+        for line in tx_result.logs or ():
+            m = _PROGRAM_INVOKE_RE.match(line)
+            if m:
+                excluded.add(m.group(1))
+    return sorted(accounts - excluded)
+
+
+class Blacklist:
+    """
+    Set of blacklisted addresses.
+    
+    Solana pubkeys are held in their fixed 32-byte decoded form, which is
+    smaller than the base58 string and can be loaded straight from a packed
+    binary snapshot. Anything that is not a pubkey is kept as a string.
+    """
+    
+    def __init__(self, addresses: Iterable[str] = ()):
+        self._keys: Set[bytes] = set()
+        self._other: Set[str] = set()
+        self.update(addresses)
+    
+    @staticmethod
+    def _key(address: str) -> Optional[bytes]:
+        if not PUBKEY_B58_MIN <= len(address) <= PUBKEY_B58_MAX:
+            return None
+        key = _b58decode(address)
+        return key if key is not None and len(key) == PUBKEY_LEN else None
+    
+    def __contains__(self, address: str) -> bool:
+        # Frontstop: skip the base58 decode when no pubkey could match
+        if not self._keys:
+            return address in self._other
+        key = self._key(address)
+        if key is not None:
+            return key in self._keys
+        return address in self._other
+    
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._other)
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in self._keys:
+            yield _b58encode(key)
+        yield from self._other
+    
+    def add(self, address: str):
+        key = self._key(address)
+        if key is not None:
+            self._keys.add(key)
+        else:
+            self._other.add(address)
+    
+    def update(self, addresses: Iterable[str]):
+        for address in addresses:
+            self.add(address)
+    
+    @property
+    def keys_only(self) -> bool:
+        """True when every entry is a pubkey, so a binary snapshot is complete."""
+        return not self._other
+    
+    def load_packed(self, packed) -> None:
+        """Add keys from a buffer of contiguous 32-byte pubkeys."""
+        self._keys.update(
+            bytes(packed[i:i + PUBKEY_LEN]) for i in range(0, len(packed), PUBKEY_LEN)
+        )
+    
+    def packed(self) -> bytes:
+        return b"".join(sorted(self._keys))
+
+
 class ThreatDetector:
     """
     Detects known malicious addresses and suspicious patterns.
@@ -50,20 +211,37 @@ class ThreatDetector:
     
     def __init__(self, blacklist_file: str = "data/blacklist.json"):
         self.blacklist_file = Path(blacklist_file)
-        self.blacklist: Set[str] = set()
-        self.threat_patterns: List[Dict] = []
+        # Packed binary copy of the JSON addresses, rebuilt when the JSON changes
+        self.blacklist_snapshot = self.blacklist_file.with_suffix(".bin")
+        # Append-only log of additions since the JSON was last compacted
+        self.blacklist_log = self.blacklist_file.with_suffix(".jsonl")
+        self._log_entries = 0
+        self.blacklist = Blacklist()
+        self._pattern_meta: List[Dict[str, str]] = []
+        self._pattern_fns: Tuple[Callable[[str, List[Dict]], Optional[ThreatAssessment]], ...] = ()
+        self._address_cache: Dict[str, Tuple[float, ThreatAssessment]] = {}
+        self._inflight: Dict[str, "asyncio.Task"] = {}
         self._load_blacklist()
         self._init_patterns()
     
     def _load_blacklist(self):
         """Load known malicious addresses."""
-        if self.blacklist_file.exists():
+        if self._snapshot_is_fresh():
+            self._load_snapshot()
+        elif self.blacklist_file.exists():
             try:
                 with open(self.blacklist_file) as f:
                     data = json.load(f)
-                    self.blacklist = set(data.get("addresses", []))
+                    self.blacklist = Blacklist(data.get("addresses", []))
             except Exception:
                 pass
+            else:
+                self._write_snapshot()
+        
+        # Replay additions not yet compacted into the JSON file
+        log_history = self._read_log()
+        self.blacklist.update(entry["address"] for entry in log_history if "address" in entry)
+        self._log_entries = len(log_history)
         
         # Add some known patterns (example - would be updated with real data)
         # These are NOT real malicious addresses - just examples
@@ -71,32 +249,64 @@ class ThreatDetector:
             # Placeholder - in production, this would be populated from threat feeds
         ])
     
+    def _snapshot_is_fresh(self) -> bool:
+        try:
+            return self.blacklist_snapshot.stat().st_mtime_ns >= self.blacklist_file.stat().st_mtime_ns
+        except OSError:
+            return False
+    
+    def _load_snapshot(self):
+        # mmap the packed keys so they are read straight from the page cache
+        with open(self.blacklist_snapshot, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as packed:
+                self.blacklist.load_packed(packed)
+    
+    def _write_snapshot(self):
+        # The binary format only holds pubkeys; otherwise the JSON stays the only source
+        if not self.blacklist.keys_only:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.blacklist_snapshot.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.blacklist.packed())
+            os.replace(tmp_path, self.blacklist_snapshot)
+        except OSError:
+            pass  # Snapshot is best-effort
+    
     def _init_patterns(self):
         """Initialize suspicious pattern detectors."""
-        self.threat_patterns = [
+        # Names/descriptions for diagnostics; index-aligned with _pattern_fns
+        self._pattern_meta = [
             {
                 "name": "drain_signature",
-                "description": "Multiple outbound transfers in rapid succession",
-                "check": self._check_drain_pattern
+                "description": "Multiple outbound transfers in rapid succession"
             },
             {
                 "name": "new_program_interaction",
-                "description": "Interaction with very new/unverified program",
-                "check": self._check_new_program
+                "description": "Interaction with very new/unverified program"
             }
         ]
+        # Bound checks, iterated directly on every address check
+        self._pattern_fns = (
+            self._check_drain_pattern,
+            self._check_new_program
+        )
     
     def _check_drain_pattern(self, address: str, tx_history: List[Dict]) -> Optional[ThreatAssessment]:
         """Check for drain attack patterns."""
-        # Look for multiple outbound transfers in short time
+        # Look for multiple outbound transfers in short time.
+        # If >5 successful txs in recent history, could be drain
+        # This is a simplified heuristic
         outbound_count = 0
-        for tx in tx_history[:10]:
+        for tx in islice(tx_history, DRAIN_WINDOW):
             if tx.get("err") is None:
                 outbound_count += 1
+                if outbound_count > DRAIN_THRESHOLD:
+                    break
         
-        # If >5 successful txs in recent history, could be drain
-        # This is a simplified heuristic
-        if outbound_count > 5:
+        if outbound_count > DRAIN_THRESHOLD:
             return ThreatAssessment(
                 address=address,
                 threat_type=ThreatType.SUSPICIOUS,
@@ -114,9 +324,70 @@ class ThreatDetector:
     
     def check_address(self, address: str) -> ThreatAssessment:
         """Check if an address is known malicious or suspicious."""
+        cached = self._get_cached(address)
+        if cached:
+            return cached
+        
         timestamp = datetime.utcnow().isoformat() + "Z"
         
         # Check blacklist
+        blacklisted = self._check_blacklist(address, timestamp)
+        if blacklisted:
+            return self._cache(blacklisted)
+        
+        # Check transaction patterns
+        tx_history = solana_rpc.get_signatures_for_address(address, limit=10)
+        return self._cache(self._check_patterns(address, tx_history, timestamp))
+    
+    async def check_address_async(self, address: str) -> ThreatAssessment:
+        """
+        Async check_address; the history lookup does not block the event loop.
+        
+        Concurrent checks of the same address share one in-flight lookup
+        (single flight), so parallel incident analyses do not stampede RPC.
+        """
+        cached = self._get_cached(address)
+        if cached:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(address)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._lookup_address_async(address))
+            self._inflight[address] = task
+            task.add_done_callback(lambda done: self._forget_inflight(address, done))
+        # Shielded so one cancelled caller does not cancel the lookup for the rest
+        return await asyncio.shield(task)
+    
+    def _forget_inflight(self, address: str, task: "asyncio.Task"):
+        if self._inflight.get(address) is task:
+            del self._inflight[address]
+    
+    async def _lookup_address_async(self, address: str) -> ThreatAssessment:
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        
+        blacklisted = self._check_blacklist(address, timestamp)
+        if blacklisted:
+            return self._cache(blacklisted)
+        
+        tx_history = await solana_rpc.get_signatures_for_address_async(address, limit=10)
+        return self._cache(self._check_patterns(address, tx_history, timestamp))
+    
+    def _get_cached(self, address: str) -> Optional[ThreatAssessment]:
+        entry = self._address_cache.get(address)
+        if entry is not None and time.monotonic() - entry[0] < ADDRESS_CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _cache(self, assessment: ThreatAssessment) -> ThreatAssessment:
+        cache = self._address_cache
+        cache.pop(assessment.address, None)
+        if len(cache) >= MAX_ADDRESS_CACHE:
+            del cache[next(iter(cache))]  # Oldest entry
+        cache[assessment.address] = (time.monotonic(), assessment)
+        return assessment
+    
+    def _check_blacklist(self, address: str, timestamp: str) -> Optional[ThreatAssessment]:
         if address in self.blacklist:
             return ThreatAssessment(
                 address=address,
@@ -126,11 +397,11 @@ class ThreatDetector:
                 source="local_blacklist",
                 timestamp=timestamp
             )
-        
-        # Check transaction patterns
-        tx_history = solana_rpc.get_signatures_for_address(address, limit=10)
-        for pattern in self.threat_patterns:
-            result = pattern["check"](address, tx_history)
+        return None
+    
+    def _check_patterns(self, address: str, tx_history: List[Dict], timestamp: str) -> ThreatAssessment:
+        for check in self._pattern_fns:
+            result = check(address, tx_history)
             if result:
                 return result
         
@@ -145,33 +416,72 @@ class ThreatDetector:
         )
     
     def add_to_blacklist(self, address: str, threat_type: ThreatType, reason: str):
-        """Add an address to the local blacklist."""
+        """
+        Add an address to the local blacklist.
+        
+        The addition is appended as one line to the blacklist log; every
+        BLACKLIST_COMPACT_EVERY additions the log is folded into the JSON file.
+        """
         self.blacklist.add(address)
+        self._address_cache.pop(address, None)
         
         # Save to file
         self.blacklist_file.parent.mkdir(parents=True, exist_ok=True)
         
-        data = {"addresses": list(self.blacklist), "updated": datetime.utcnow().isoformat() + "Z"}
+        entry = {
+            "address": address,
+            "threat_type": threat_type.value,
+            "reason": reason,
+            "added": datetime.utcnow().isoformat() + "Z"
+        }
+        with open(self.blacklist_log, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+        self._log_entries += 1
         
+        if self._log_entries >= BLACKLIST_COMPACT_EVERY:
+            self.compact()
+    
+    def compact(self):
+        """Fold the append-only blacklist log into the JSON file and clear the log."""
+        log_history = self._read_log()
+        if not log_history:
+            return
+        
+        history = []
         if self.blacklist_file.exists():
             try:
                 with open(self.blacklist_file) as f:
-                    existing = json.load(f)
-                    data["history"] = existing.get("history", [])
-            except:
-                data["history"] = []
-        else:
-            data["history"] = []
+                    history = json.load(f).get("history", [])
+            except Exception:
+                history = []
         
-        data["history"].append({
-            "address": address,
-            "threat_type": threat_type.value,
-            "reason": reason,
-            "added": datetime.utcnow().isoformat() + "Z"
-        })
+        data = {
+            "addresses": list(self.blacklist),
+            "updated": datetime.utcnow().isoformat() + "Z",
+            "history": history + log_history
+        }
         
-        with open(self.blacklist_file, 'w') as f:
+        fd, tmp_path = tempfile.mkstemp(dir=self.blacklist_file.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.blacklist_file)
+        
+        self.blacklist_log.unlink(missing_ok=True)
+        self._log_entries = 0
+        self._write_snapshot()
+    
+    def _read_log(self) -> List[Dict]:
+        entries = []
+        try:
+            with open(self.blacklist_log) as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # Torn final line from an interrupted write
+        except FileNotFoundError:
+            pass
+        return entries
     
     def analyze_incident(self, incident_evidence: Dict) -> Optional[ThreatAssessment]:
         """
@@ -181,17 +491,11 @@ class ThreatDetector:
         - "Agent broke due to bug" 
         - "Agent was attacked/scammed"
         """
-        # Look for addresses in the evidence
-        addresses_to_check = []
-        
         # Extract any Solana addresses from evidence
-        if "transactions" in incident_evidence:
-            for tx in incident_evidence.get("transactions", {}).get("failures", []):
-                sig = tx.get("signature")
-                if sig:
-                    # Get transaction details to find involved addresses
-                    tx_result = solana_rpc.get_transaction(sig)
-                    # Would extract addresses from tx_result.logs
+        signatures = self._failed_signatures(incident_evidence)
+        # Get transaction details to find involved addresses (one batched request)
+        tx_results = solana_rpc.get_transactions(signatures)
+        addresses_to_check = involved_addresses(tx_results)
         
         # Check each address
         for addr in addresses_to_check:
@@ -200,6 +504,33 @@ class ThreatDetector:
                 return assessment
         
         return None
+    
+    async def analyze_incident_async(self, incident_evidence: Dict) -> Optional[ThreatAssessment]:
+        """Async analyze_incident; transaction and address lookups run concurrently."""
+        signatures = self._failed_signatures(incident_evidence)
+        tx_results = await asyncio.gather(
+            *(solana_rpc.get_transaction_async(sig) for sig in signatures)
+        )
+        addresses_to_check = involved_addresses(tx_results)
+        
+        assessments = await asyncio.gather(
+            *(self.check_address_async(addr) for addr in addresses_to_check)
+        )
+        for assessment in assessments:
+            if assessment.threat_type != ThreatType.CLEAN:
+                return assessment
+        
+        return None
+    
+    @staticmethod
+    def _failed_signatures(incident_evidence: Dict) -> List[str]:
+        if "transactions" not in incident_evidence:
+            return []
+        return [
+            tx["signature"]
+            for tx in incident_evidence.get("transactions", {}).get("failures", [])
+            if tx.get("signature")
+        ]
 
 
 # Global detector instance
@@ -216,6 +547,11 @@ def analyze_incident_for_threats(evidence: Dict) -> Optional[ThreatAssessment]:
     return threat_detector.analyze_incident(evidence)
 
 
+async def analyze_incident_for_threats_async(evidence: Dict) -> Optional[ThreatAssessment]:
+    """Async analyze_incident_for_threats, for callers already on an event loop."""
+    return await threat_detector.analyze_incident_async(evidence)
+
+
 def blacklist_address(address: str, threat_type: ThreatType, reason: str):
     """Add address to blacklist."""
     threat_detector.add_to_blacklist(address, threat_type, reason)
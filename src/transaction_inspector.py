@@ -5,13 +5,20 @@ Deep inspection of Solana transactions for failure analysis.
 SAFETY: Read-only operations only.
 """
 
+import asyncio
+import re
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 
 import solana_rpc
 
 
+# "Program <id> invoke [N]" lines in transaction logs
+_PROGRAM_INVOKE_RE = re.compile(r"Program (\S+) invoke")
+
+
 class FailureCategory(Enum):
     """Categories of transaction failures."""
     INSUFFICIENT_FUNDS = "insufficient_funds"
@@ -39,6 +46,8 @@ class TransactionAnalysis:
     recommendations: List[str]
 
 
+# Error strings recur across a wallet's failures, so verdicts are memoized
+@lru_cache(maxsize=1024)
 def categorize_error(error: str) -> FailureCategory:
     """Categorize a transaction error by its message."""
     if not error:
@@ -49,7 +58,8 @@ def categorize_error(error: str) -> FailureCategory:
     if "insufficient" in error_lower or "lamports" in error_lower:
         return FailureCategory.INSUFFICIENT_FUNDS
     
-    if "invalid instruction" in error_lower or "instruction" in error_lower:
+    # Also covers "invalid instruction"
+    if "instruction" in error_lower:
         return FailureCategory.INVALID_INSTRUCTION
     
     if "account" in error_lower and ("not found" in error_lower or "missing" in error_lower):
@@ -73,56 +83,59 @@ def categorize_error(error: str) -> FailureCategory:
     return FailureCategory.UNKNOWN
 
 
-def get_recommendations(category: FailureCategory) -> List[str]:
+# Built once at import; tuples, so the shared values cannot be mutated
+_RECOMMENDATIONS: Dict[FailureCategory, Tuple[str, ...]] = {
+    FailureCategory.INSUFFICIENT_FUNDS: (
+        "Check account balance",
+        "Request devnet airdrop if on devnet",
+        "Reduce transaction amount"
+    ),
+    FailureCategory.INVALID_INSTRUCTION: (
+        "Verify instruction data format",
+        "Check account permissions",
+        "Review program documentation"
+    ),
+    FailureCategory.ACCOUNT_NOT_FOUND: (
+        "Verify account address",
+        "Ensure account is initialized",
+        "Check if account was closed"
+    ),
+    FailureCategory.PROGRAM_ERROR: (
+        "Check program logs for details",
+        "Verify input parameters",
+        "Ensure correct program version"
+    ),
+    FailureCategory.SIGNATURE_ERROR: (
+        "Verify signer keys",
+        "Check transaction signing order",
+        "Ensure all required signers present"
+    ),
+    FailureCategory.BLOCKHASH_EXPIRED: (
+        "Retry with fresh blockhash",
+        "Reduce transaction preparation time",
+        "Use durable nonces for long-lived transactions"
+    ),
+    FailureCategory.RATE_LIMITED: (
+        "Apply cooldown period",
+        "Switch to backup RPC endpoint",
+        "Implement exponential backoff"
+    ),
+    FailureCategory.NETWORK_ERROR: (
+        "Retry request",
+        "Check network connectivity",
+        "Try alternative RPC endpoint"
+    ),
+    FailureCategory.UNKNOWN: (
+        "Check transaction logs",
+        "Review error details",
+        "Consult documentation"
+    )
+}
+
+
+def get_recommendations(category: FailureCategory) -> Tuple[str, ...]:
     """Get recovery recommendations for a failure category."""
-    recommendations = {
-        FailureCategory.INSUFFICIENT_FUNDS: [
-            "Check account balance",
-            "Request devnet airdrop if on devnet",
-            "Reduce transaction amount"
-        ],
-        FailureCategory.INVALID_INSTRUCTION: [
-            "Verify instruction data format",
-            "Check account permissions",
-            "Review program documentation"
-        ],
-        FailureCategory.ACCOUNT_NOT_FOUND: [
-            "Verify account address",
-            "Ensure account is initialized",
-            "Check if account was closed"
-        ],
-        FailureCategory.PROGRAM_ERROR: [
-            "Check program logs for details",
-            "Verify input parameters",
-            "Ensure correct program version"
-        ],
-        FailureCategory.SIGNATURE_ERROR: [
-            "Verify signer keys",
-            "Check transaction signing order",
-            "Ensure all required signers present"
-        ],
-        FailureCategory.BLOCKHASH_EXPIRED: [
-            "Retry with fresh blockhash",
-            "Reduce transaction preparation time",
-            "Use durable nonces for long-lived transactions"
-        ],
-        FailureCategory.RATE_LIMITED: [
-            "Apply cooldown period",
-            "Switch to backup RPC endpoint",
-            "Implement exponential backoff"
-        ],
-        FailureCategory.NETWORK_ERROR: [
-            "Retry request",
-            "Check network connectivity",
-            "Try alternative RPC endpoint"
-        ],
-        FailureCategory.UNKNOWN: [
-            "Check transaction logs",
-            "Review error details",
-            "Consult documentation"
-        ]
-    }
-    return recommendations.get(category, recommendations[FailureCategory.UNKNOWN])
+    return _RECOMMENDATIONS.get(category, _RECOMMENDATIONS[FailureCategory.UNKNOWN])
 
 
 def analyze_transaction(
@@ -132,6 +145,14 @@ def analyze_transaction(
     """Perform deep analysis of a transaction."""
     
     tx_result = solana_rpc.get_transaction(signature, rpc_url)
+    return analyze_transaction_from_result(signature, tx_result)
+
+
+def analyze_transaction_from_result(
+    signature: str,
+    tx_result: solana_rpc.TransactionResult
+) -> TransactionAnalysis:
+    """Analyze an already-fetched transaction (see analyze_transaction)."""
     
     if tx_result.status == solana_rpc.TransactionStatus.NOT_FOUND:
         return TransactionAnalysis(
@@ -153,20 +174,18 @@ def analyze_transaction(
     
     if not success and tx_result.error:
         failure_category = categorize_error(tx_result.error)
-        recommendations = get_recommendations(failure_category)
+        recommendations = list(get_recommendations(failure_category))
     
-    # Extract program IDs from logs
+    # Extract program IDs from logs, deduplicated in first-seen order
     program_ids = []
     if tx_result.logs:
+        seen = set()
+        match_invoke = _PROGRAM_INVOKE_RE.match
         for log in tx_result.logs:
-            if "Program " in log and " invoke" in log:
-                # Extract program ID from "Program <id> invoke [N]"
-                parts = log.split()
-                if len(parts) >= 2:
-                    program_ids.append(parts[1])
-    
-    # Deduplicate program IDs
-    program_ids = list(dict.fromkeys(program_ids))
+            m = match_invoke(log)
+            if m and m.group(1) not in seen:
+                seen.add(m.group(1))
+                program_ids.append(m.group(1))
     
     return TransactionAnalysis(
         signature=signature,
@@ -181,43 +200,108 @@ def analyze_transaction(
     )
 
 
+def _result_from_status(sig_info: Dict) -> solana_rpc.TransactionResult:
+    """TransactionResult from a getSignaturesForAddress entry (no logs or fee)."""
+    err = sig_info.get("err")
+    return solana_rpc.TransactionResult(
+        signature=sig_info["signature"],
+        status=solana_rpc.TransactionStatus.FAILED if err else solana_rpc.TransactionStatus.SUCCESS,
+        slot=sig_info.get("slot"),
+        error=str(err) if err else None,  # Same form as _parse_transaction
+        block_time=sig_info.get("blockTime")
+    )
+
+
 def analyze_recent_failures(
     address: str,
     limit: int = 10,
-    rpc_url: str = solana_rpc.DEVNET_RPC
+    rpc_url: str = solana_rpc.DEVNET_RPC,
+    deep: bool = False
 ) -> Dict[str, Any]:
-    """Analyze recent transaction failures for an address."""
+    """
+    Analyze recent transaction failures for an address.
+    
+    Failures are categorized from the error already included in the
+    signature listing. Pass deep=True to fetch each failed transaction
+    instead (one batched request).
+    """
     
     signatures = solana_rpc.get_signatures_for_address(address, limit, rpc_url)
     
+    failed_infos = [sig_info for sig_info in signatures if sig_info.get("err")]
+    failed = [sig_info["signature"] for sig_info in failed_infos]
+    if deep:
+        tx_results = solana_rpc.get_transactions(failed, rpc_url)
+    else:
+        tx_results = [_result_from_status(sig_info) for sig_info in failed_infos]
+    return _summarize_failures(address, len(signatures), failed, tx_results)
+
+
+async def analyze_recent_failures_async(
+    address: str,
+    limit: int = 10,
+    rpc_url: str = solana_rpc.DEVNET_RPC,
+    deep: bool = False
+) -> Dict[str, Any]:
+    """
+    Async analyze_recent_failures.
+    
+    With deep=True, failed transactions are fetched as concurrent requests
+    instead of one batch, so a slow or failing lookup does not hold up or
+    sink the others.
+    """
+    signatures = await solana_rpc.get_signatures_for_address_async(address, limit, rpc_url)
+    
+    failed_infos = [sig_info for sig_info in signatures if sig_info.get("err")]
+    failed = [sig_info["signature"] for sig_info in failed_infos]
+    if not deep:
+        tx_results = [_result_from_status(sig_info) for sig_info in failed_infos]
+        return _summarize_failures(address, len(signatures), failed, tx_results)
+    
+    fetched = await asyncio.gather(
+        *(solana_rpc.get_transaction_async(sig, rpc_url) for sig in failed),
+        return_exceptions=True
+    )
+    tx_results = [
+        solana_rpc.TransactionResult(
+            signature=sig,
+            status=solana_rpc.TransactionStatus.NOT_FOUND,
+            error=str(result)
+        ) if isinstance(result, Exception) else result
+        for sig, result in zip(failed, fetched)
+    ]
+    return _summarize_failures(address, len(signatures), failed, tx_results)
+
+
+def _summarize_failures(
+    address: str,
+    total_checked: int,
+    failed: List[str],
+    tx_results: List[solana_rpc.TransactionResult]
+) -> Dict[str, Any]:
     results = {
         "address": address,
-        "total_checked": len(signatures),
-        "successful": 0,
-        "failed": 0,
+        "total_checked": total_checked,
+        "successful": total_checked - len(failed),
+        "failed": len(failed),
         "failure_breakdown": {},
         "failures": []
     }
     
-    for sig_info in signatures:
-        if sig_info.get("err"):
-            results["failed"] += 1
-            
-            # Analyze the failure
-            analysis = analyze_transaction(sig_info["signature"], rpc_url)
-            
-            if analysis.failure_category:
-                cat = analysis.failure_category.value
-                results["failure_breakdown"][cat] = results["failure_breakdown"].get(cat, 0) + 1
-            
-            results["failures"].append({
-                "signature": sig_info["signature"],
-                "category": analysis.failure_category.value if analysis.failure_category else "unknown",
-                "error": analysis.error_message,
-                "recommendations": analysis.recommendations
-            })
-        else:
-            results["successful"] += 1
+    for signature, tx_result in zip(failed, tx_results):
+        # Analyze the failure
+        analysis = analyze_transaction_from_result(signature, tx_result)
+        
+        if analysis.failure_category:
+            cat = analysis.failure_category.value
+            results["failure_breakdown"][cat] = results["failure_breakdown"].get(cat, 0) + 1
+        
+        results["failures"].append({
+            "signature": signature,
+            "category": analysis.failure_category.value if analysis.failure_category else "unknown",
+            "error": analysis.error_message,
+            "recommendations": analysis.recommendations
+        })
     
     return results
 
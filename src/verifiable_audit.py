@@ -7,7 +7,7 @@ All test results are:
 1. Hashed with SHA-256
 2. Timestamped
 3. Signed with agent identity
-4. Stored in tamper-evident log
+4. Stored in tamper-evident log, each entry chained to the one before
 
 Anyone can verify:
 - Test was run at claimed time
@@ -17,13 +17,91 @@ Anyone can verify:
 
 import hashlib
 import json
+import mmap
 import os
+import tempfile
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 
+# orjson (optional - faster encoding/decoding of log lines)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# verify_log spreads logs with at least this many unverified bytes across
+# CPU cores (when there is more than one); below it, process startup costs
+# more than it saves
+PARALLEL_VERIFY_MIN_BYTES = 4 << 20
+# Lines per process pool task; at most two tasks per worker are in flight,
+# so parallel verification holds a bounded number of lines in memory
+VERIFY_BATCH_LINES = 1024
+
+
+def _dumps_line(obj: Dict) -> bytes:
+    """One JSONL log line. Hash inputs keep json.dumps (see _hash)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # e.g. an int wider than 64 bits in details - json.dumps handles it
+    return (json.dumps(obj) + "\n").encode()
+
+
+def _loads_line(line: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity written by json.dumps; a truly bad line fails below too
+    return json.loads(line)
+
+
+def _map_file(f):
+    """Read-only mmap of an open file (a context manager); b"" if it is empty."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(b"")
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _split_lines(buf, start: int = 0) -> Iterator[bytes]:
+    """
+    Lines of buf from offset start, each keeping its newline.
+    
+    Boundaries come from buf.find (memchr), so nothing is decoded to str.
+    """
+    end = len(buf)
+    find = buf.find
+    while start < end:
+        nl = find(b"\n", start)
+        stop = end if nl == -1 else nl + 1
+        yield buf[start:stop]
+        start = stop
+
+
+def merkle_root(leaves: List[str]) -> str:
+    """Pairwise SHA-256 Merkle root; an odd node out is paired with itself."""
+    level = [hashlib.sha256(leaf.encode()).digest() for leaf in leaves]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0].hex()
+
+
+@dataclass(slots=True, frozen=True)
 class AuditEntry:
     """Single verifiable audit entry."""
     entry_id: str
@@ -35,38 +113,103 @@ class AuditEntry:
     result: str  # pass/fail/error
     details: Dict[str, Any]
     signature: str  # Hash of all above fields
+    # Signature of the previous entry; "" starts a chain (and in older logs)
+    prev_signature: str = ""
     
     def to_dict(self) -> Dict:
         return asdict(self)
 
 
+def _sign(entry_data: Dict) -> str:
+    """Signature for an entry: SHA-256 of its fields joined with "|"."""
+    signing_string = "|".join([
+        entry_data["entry_id"],
+        entry_data["timestamp"],
+        entry_data["agent_id"],
+        entry_data["action"],
+        entry_data["input_hash"],
+        entry_data["output_hash"],
+        entry_data["result"]
+    ])
+    # Chained entries also sign their link; unchained ones keep the old format
+    if entry_data.get("prev_signature"):
+        signing_string += "|" + entry_data["prev_signature"]
+    return hashlib.sha256(signing_string.encode()).hexdigest()
+
+
+def _check_line(line: bytes) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Check one log line on its own: (error, signature, prev_signature).
+    
+    Module-level so process pool workers can run it; the hash chain spans
+    lines and is checked by the caller.
+    """
+    try:
+        entry = AuditEntry(**_loads_line(line))
+    except Exception as e:
+        return f"Parse error - {e}", None, None
+    if _sign(entry.to_dict()) != entry.signature:
+        return "Invalid signature", entry.signature, entry.prev_signature
+    return None, entry.signature, entry.prev_signature
+
+
+def _check_batch(lines: List[bytes]) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """_check_line over a batch of lines (one process pool task)."""
+    return [_check_line(line) for line in lines]
+
+
+def _check_parallel(lines: Iterator[bytes], pool, workers: int) -> Iterator[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """
+    _check_line results for lines, in order, computed by pool.
+    
+    Lines are read in VERIFY_BATCH_LINES batches and submitted only while
+    fewer than two batches per worker are pending.
+    """
+    pending = deque()
+    while True:
+        batch = list(islice(lines, VERIFY_BATCH_LINES))
+        if not batch:
+            break
+        pending.append(pool.submit(_check_batch, batch))
+        if len(pending) >= 2 * workers:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
 class VerifiableAudit:
-    """Verifiable audit trail for agent actions."""
+    """
+    Verifiable audit trail for agent actions.
+    
+    Entries are written through a long-lived buffered handle. Call flush()
+    at durability points, or pass sync_every=N to flush and fsync after
+    every N entries. Buffered entries are also written on close() and at
+    interpreter exit.
+    """
     
-    def __init__(self, agent_id: str, log_file: str = "audit_log.jsonl"):
+    def __init__(self, agent_id: str, log_file: str = "audit_log.jsonl", sync_every: int = 0):
         self.agent_id = agent_id
         self.log_file = log_file
+        self.sync_every = sync_every
         self.entries: List[AuditEntry] = []
         self._counter = 0
+        self._fh = None
+        self._unsynced = 0
+        self._last_signature: Optional[str] = None
+        self.checkpoint_file = f"{log_file}.checkpoint"
     
     def _hash(self, data: Any) -> str:
         """Create SHA-256 hash of data."""
+        # Stays on json.dumps: its exact output is what recorded hashes cover
         if isinstance(data, dict):
             data = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(str(data).encode()).hexdigest()
+        elif not isinstance(data, str):
+            data = str(data)
+        return hashlib.sha256(data.encode()).hexdigest()
     
     def _sign_entry(self, entry_data: Dict) -> str:
         """Create signature for entry (hash of all fields)."""
-        signing_string = "|".join([
-            entry_data["entry_id"],
-            entry_data["timestamp"],
-            entry_data["agent_id"],
-            entry_data["action"],
-            entry_data["input_hash"],
-            entry_data["output_hash"],
-            entry_data["result"]
-        ])
-        return self._hash(signing_string)
+        return _sign(entry_data)
     
     def record(
         self,
@@ -89,21 +232,69 @@ class VerifiableAudit:
             "input_hash": self._hash(input_data),
             "output_hash": self._hash(output_data),
             "result": result,
-            "details": details or {}
+            "details": details or {},
+            "prev_signature": self._chain_head()
         }
         
         signature = self._sign_entry(entry_data)
         entry = AuditEntry(**entry_data, signature=signature)
         
-        self.entries.append(entry)
+        # Persist first, so a failed write leaves entries and the chain head untouched
         self._persist(entry)
+        self.entries.append(entry)
+        self._last_signature = signature
         
         return entry
     
     def _persist(self, entry: AuditEntry):
         """Append entry to log file."""
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry.to_dict()) + "\n")
+        if self._fh is None:
+            self._fh = open(self.log_file, 'ab', buffering=1 << 16)
+            # Closing flushes the buffer; runs on GC or at interpreter exit
+            weakref.finalize(self, self._fh.close)
+        self._fh.write(_dumps_line(entry.to_dict()))
+        self._unsynced += 1
+        if self.sync_every and self._unsynced >= self.sync_every:
+            self.flush()
+    
+    def _chain_head(self) -> str:
+        """Signature the next entry links to; picks up an existing log's last entry."""
+        if self._last_signature is None:
+            self._last_signature = ""
+            if os.path.exists(self.log_file):
+                if self._fh is not None:
+                    self._fh.flush()
+                try:
+                    self._last_signature = _loads_line(self._last_line())["signature"]
+                except Exception:
+                    pass  # Empty log or unreadable tail: start a new chain
+        return self._last_signature
+    
+    def _last_line(self, block: int = 4096) -> bytes:
+        """Read the log's final line by scanning backwards from the end."""
+        with open(self.log_file, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            tail = b""
+            while pos > 0 and tail.rstrip(b"\n").count(b"\n") < 1:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+        return tail.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    
+    def flush(self):
+        """Write buffered entries and fsync them to disk."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+    
+    def close(self):
+        """Flush and close the log file; a later record() reopens it."""
+        if self._fh is not None:
+            self.flush()
+            self._fh.close()
+            self._fh = None
     
     def verify_entry(self, entry: AuditEntry) -> bool:
         """Verify an audit entry's signature."""
@@ -113,23 +304,27 @@ class VerifiableAudit:
         return expected_sig == entry.signature
     
     def verify_log(self) -> Dict:
-        """Verify entire audit log."""
+        """
+        Verify entire audit log.
+        
+        Each entry's signature is checked, and so is its link to the entry
+        before it, so removed or reordered lines are caught too. If a
+        checkpoint exists and the log still starts with the exact bytes it
+        covered, those entries were verified when it was taken and are only
+        counted here.
+        """
         if not os.path.exists(self.log_file):
             return {"valid": True, "entries": 0, "errors": []}
         
+        self._flush_buffer()
         errors = []
-        count = 0
+        offset, count, prev = self._trusted_prefix(errors)
         
-        with open(self.log_file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                try:
-                    data = json.loads(line)
-                    entry = AuditEntry(**data)
-                    if not self.verify_entry(entry):
-                        errors.append(f"Line {line_num}: Invalid signature")
-                    count += 1
-                except Exception as e:
-                    errors.append(f"Line {line_num}: Parse error - {e}")
+        for line_num, error, parsed in self._check_lines(offset, count, prev):
+            if error:
+                errors.append(f"Line {line_num}: {error}")
+            if parsed:
+                count += 1
         
         return {
             "valid": len(errors) == 0,
@@ -137,6 +332,118 @@ class VerifiableAudit:
             "errors": errors
         }
     
+    def iter_verify_log(self) -> Iterator[Tuple[int, bool, Optional[str]]]:
+        """
+        Stream verification results as (line_num, ok, message) tuples.
+        
+        Same checks as verify_log, one tuple per line after any valid
+        checkpoint, in constant memory. A checkpoint mismatch is reported
+        first, with line_num 0.
+        """
+        if not os.path.exists(self.log_file):
+            return
+        
+        self._flush_buffer()
+        errors = []
+        offset, count, prev = self._trusted_prefix(errors)
+        for error in errors:
+            yield 0, False, error
+        
+        for line_num, error, _ in self._check_lines(offset, count, prev):
+            yield line_num, error is None, error
+    
+    def is_valid_fast(self) -> bool:
+        """True if the log verifies; stops at the first problem found."""
+        return all(ok for _, ok, _ in self.iter_verify_log())
+    
+    def _flush_buffer(self):
+        # Make this instance's buffered entries visible to readers of the file
+        if self._fh is not None:
+            self._fh.flush()
+    
+    def _check_lines(self, offset: int, count: int, prev: str) -> Iterator[Tuple[int, Optional[str], bool]]:
+        """(line_num, error, parsed) for each log line from byte offset on."""
+        with open(self.log_file, 'rb') as f, _map_file(f) as buf:
+            lines = _split_lines(buf, offset)
+            workers = os.cpu_count() or 1
+            pool = None
+            if workers > 1 and len(buf) - offset >= PARALLEL_VERIFY_MIN_BYTES:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                checked = _check_parallel(lines, pool, workers) if pool else map(_check_line, lines)
+                for line_num, (error, signature, prev_signature) in enumerate(checked, count + 1):
+                    if signature is None:
+                        yield line_num, error, False
+                        continue
+                    if not error and prev_signature and prev_signature != prev:
+                        error = "Broken hash chain"
+                    prev = signature
+                    yield line_num, error, True
+            finally:
+                if pool is not None:
+                    # Early exit (is_valid_fast) should not wait on queued chunks
+                    pool.shutdown(cancel_futures=True)
+    
+    def checkpoint(self) -> Optional[str]:
+        """
+        Verify the log and record a checkpoint of it.
+        
+        The checkpoint holds a Merkle root over all entry signatures (the
+        value to publish) plus a digest of the log bytes it covers, which
+        lets verify_log skip re-verifying that prefix. Returns the root, or
+        None if the log does not verify.
+        """
+        if not self.verify_log()["valid"]:
+            return None
+        
+        digest = hashlib.sha256()
+        signatures = []
+        offset = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'rb') as f:
+                for line in f:
+                    digest.update(line)
+                    offset += len(line)
+                    signatures.append(_loads_line(line)["signature"])
+        
+        root = merkle_root(signatures)
+        record = {
+            "checkpoint": root,
+            "index": len(signatures),
+            "offset": offset,
+            "sha256": digest.hexdigest(),
+            "last_signature": signatures[-1] if signatures else ""
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.checkpoint_file)))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, self.checkpoint_file)
+        return root
+    
+    def _trusted_prefix(self, errors: List[str]):
+        """(offset, entries, last signature) covered by a still-valid checkpoint."""
+        try:
+            with open(self.checkpoint_file) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return 0, 0, ""
+        
+        digest = hashlib.sha256()
+        remaining = checkpoint["offset"]
+        with open(self.log_file, 'rb') as f:
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        
+        if remaining or digest.hexdigest() != checkpoint["sha256"]:
+            # Checkpointed entries changed; re-verify everything to locate it
+            errors.append(f"Checkpoint mismatch: log changed within its first {checkpoint['index']} entries")
+            return 0, 0, ""
+        return checkpoint["offset"], checkpoint["index"], checkpoint["last_signature"]
+    
     def record_test(
         self,
         test_name: str,
@@ -194,6 +501,7 @@ Anyone can re-verify by:
 1. Parsing each JSONL line
 2. Reconstructing the signing string
 3. Comparing SHA-256 hash to stored signature
+4. Checking each entry's prev_signature matches the entry before it
 
 ## How to Verify
 ```python
@@ -7,13 +7,40 @@ Confirms recovery success after actions are taken.
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional, Tuple, TypeVar
 
 from config import get_agent, AgentStatus
 from observer import check_agent, check_process_running
 from recoverer import RecoveryPlan, RecoveryResult, RecoveryAction, RecoveryStatus
 import solana_rpc
 
+T = TypeVar("T")
+
+
+def _poll_until(
+    check_fn: Callable[[], T],
+    done: Callable[[T], bool],
+    deadline_s: float,
+    initial: float = 0.25,
+    factor: float = 2.0,
+    cap: float = 2.0
+) -> T:
+    """
+    Call check_fn until done(result) or deadline_s elapses.
+    
+    Sleeps between attempts grow from initial by factor, up to cap.
+    Returns the last result either way.
+    """
+    deadline = time.monotonic() + deadline_s
+    interval = initial
+    while True:
+        result = check_fn()
+        remaining = deadline - time.monotonic()
+        if done(result) or remaining <= 0:
+            return result
+        time.sleep(min(interval, cap, remaining))
+        interval *= factor
+
 
 @dataclass
 class VerificationResult:
@@ -28,17 +55,27 @@ class VerificationResult:
 
 
 class Verifier:
-    """Verifies that recovery actions were successful."""
+    """
+    Verifies that recovery actions were successful.
+    
+    Checks are polled with backoff until they pass or max_wait_seconds
+    elapses, so a fast recovery is confirmed as soon as it takes effect.
+    """
     
-    def __init__(self, verification_delay_seconds: int = 10):
-        self.verification_delay = verification_delay_seconds
+    def __init__(self, max_wait_seconds: float = 10, verification_delay_seconds: Optional[float] = None):
+        # verification_delay_seconds is the old name, kept as an alias
+        if verification_delay_seconds is not None:
+            max_wait_seconds = verification_delay_seconds
+        self.max_wait_seconds = max_wait_seconds
+    
+    @property
+    def verification_delay(self) -> float:
+        """Old name for max_wait_seconds."""
+        return self.max_wait_seconds
     
     def verify(self, plan: RecoveryPlan, result: RecoveryResult) -> VerificationResult:
         """Verify a recovery action was successful."""
         
-        # Wait for recovery to take effect
-        time.sleep(self.verification_delay)
-        
         timestamp = datetime.utcnow().isoformat() + "Z"
         
         # Skip verification for certain statuses
@@ -76,6 +113,26 @@ class Verifier:
     
     def _verify_restart(self, plan: RecoveryPlan, timestamp: str) -> VerificationResult:
         """Verify a process restart was successful."""
+        checks_passed, checks_failed, details = _poll_until(
+            lambda: self._restart_checks(plan),
+            # Done once everything passes, or when there is nothing to check
+            lambda checks: checks[1] == 0,
+            self.max_wait_seconds
+        )
+        
+        verified = checks_passed > 0 and checks_failed == 0
+        
+        return VerificationResult(
+            incident_id=plan.incident_id,
+            verified=verified,
+            timestamp=timestamp,
+            checks_passed=checks_passed,
+            checks_failed=checks_failed,
+            details=details,
+            message="Process restart verified" if verified else "Process restart verification failed"
+        )
+    
+    def _restart_checks(self, plan: RecoveryPlan) -> Tuple[int, int, dict]:
         checks_passed = 0
         checks_failed = 0
         details = {}
@@ -102,23 +159,17 @@ class Verifier:
             else:
                 checks_failed += 1
         
-        verified = checks_passed > 0 and checks_failed == 0
-        
-        return VerificationResult(
-            incident_id=plan.incident_id,
-            verified=verified,
-            timestamp=timestamp,
-            checks_passed=checks_passed,
-            checks_failed=checks_failed,
-            details=details,
-            message="Process restart verified" if verified else "Process restart verification failed"
-        )
+        return checks_passed, checks_failed, details
     
     def _verify_rpc_switch(self, plan: RecoveryPlan, result: RecoveryResult, timestamp: str) -> VerificationResult:
         """Verify RPC endpoint switch was successful."""
         new_endpoint = result.details.get("new_endpoint", solana_rpc.DEVNET_RPC)
         
-        health = solana_rpc.check_rpc_health(new_endpoint)
+        health = _poll_until(
+            lambda: solana_rpc.check_rpc_health(new_endpoint),
+            lambda h: h.healthy,
+            self.max_wait_seconds
+        )
         
         return VerificationResult(
             incident_id=plan.incident_id,
@@ -137,7 +188,7 @@ class Verifier:
     
     def _verify_cooldown(self, plan: RecoveryPlan, timestamp: str) -> VerificationResult:
         """Verify cooldown was applied (and RPC is now accessible)."""
-        health = solana_rpc.devnet_health()
+        health = _poll_until(solana_rpc.devnet_health, lambda h: h.healthy, self.max_wait_seconds)
         
         return VerificationResult(
             incident_id=plan.incident_id,
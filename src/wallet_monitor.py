@@ -10,8 +10,10 @@ Inspired by Openfort's feedback on the forum.
 SAFETY: Read-only, never handles private keys or signs transactions.
 """
 
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Deque, Optional, List, Dict, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -56,24 +58,57 @@ class WalletMonitor:
     Thresholds (configurable):
     - Warning: 0.05 SOL (enough for ~50 transactions)
     - Critical: 0.01 SOL (enough for ~10 transactions)
+    
+    A wallet checked within the last ttl_seconds is answered from cache.
     """
     
     def __init__(
         self,
         warning_threshold_sol: float = 0.05,
-        critical_threshold_sol: float = 0.01
+        critical_threshold_sol: float = 0.01,
+        ttl_seconds: float = 5.0
     ):
         self.warning_threshold = warning_threshold_sol
         self.critical_threshold = critical_threshold_sol
+        self.ttl_seconds = ttl_seconds
         self.monitored_wallets: Dict[str, WalletHealth] = {}
-        self.alert_history: List[BalanceAlert] = []
+        # Only the 100 most recent alerts are kept
+        self.alert_history: Deque[BalanceAlert] = deque(maxlen=100)
+        # address -> (monotonic time checked, result)
+        self._recent: Dict[str, Tuple[float, WalletHealth]] = {}
     
-    def check_wallet(self, address: str) -> WalletHealth:
-        """Check the balance and health of a wallet."""
-        timestamp = datetime.utcnow().isoformat() + "Z"
+    def check_wallet(self, address: str, force: bool = False) -> WalletHealth:
+        """
+        Check the balance and health of a wallet.
+        
+        Reuses a result younger than ttl_seconds unless force is set; cached
+        answers do not raise new alerts.
+        """
+        if not force:
+            cached = self._get_recent(address)
+            if cached:
+                return cached
         
-        # Get account info
-        account = solana_rpc.get_account_info(address)
+        return self._assess(address, solana_rpc.get_account_info(address))
+    
+    def _get_recent(self, address: str) -> Optional[WalletHealth]:
+        entry = self._recent.get(address)
+        if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+            return entry[1]
+        return None
+    
+    def _assess(self, address: str, account: solana_rpc.AccountInfo) -> WalletHealth:
+        """Grade a fetched account against the thresholds and cache the result."""
+        health = self._grade(address, account)
+        # A failed lookup is not an empty wallet; ask again next time
+        if account.error is None:
+            self._recent[address] = (time.monotonic(), health)
+        else:
+            self._recent.pop(address, None)
+        return health
+    
+    def _grade(self, address: str, account: solana_rpc.AccountInfo) -> WalletHealth:
+        timestamp = datetime.utcnow().isoformat() + "Z"
         
         if not account.exists:
             return WalletHealth(
@@ -135,22 +170,33 @@ class WalletMonitor:
             timestamp=health.timestamp
         )
         self.alert_history.append(alert)
-        
-        # Keep only recent alerts
-        self.alert_history = self.alert_history[-100:]
     
-    def check_multiple(self, addresses: List[str]) -> Dict[str, WalletHealth]:
-        """Check multiple wallets at once."""
+    def check_multiple(self, addresses: List[str], force: bool = False) -> Dict[str, WalletHealth]:
+        """
+        Check multiple wallets at once.
+        
+        Wallets not answered from cache are fetched together via
+        getMultipleAccounts (one request per 100 addresses).
+        """
         results = {}
+        to_fetch = []
         for addr in addresses:
-            results[addr] = self.check_wallet(addr)
+            cached = None if force else self._get_recent(addr)
+            if cached:
+                results[addr] = cached
+            elif addr not in results:
+                results[addr] = None
+                to_fetch.append(addr)
+        
+        for addr, account in zip(to_fetch, solana_rpc.get_accounts_info(to_fetch)):
+            results[addr] = self._assess(addr, account)
         return results
     
     def get_alerts(self, severity: Optional[BalanceStatus] = None) -> List[BalanceAlert]:
         """Get recent alerts, optionally filtered by severity."""
         if severity:
             return [a for a in self.alert_history if a.status == severity]
-        return self.alert_history
+        return list(self.alert_history)
     
     def estimate_transactions_remaining(self, address: str, avg_fee_lamports: int = 5000) -> int:
         """Estimate how many transactions can be sent before wallet is empty."""
@@ -168,9 +214,9 @@ class WalletMonitor:
 wallet_monitor = WalletMonitor()
 
 
-def check_wallet(address: str) -> WalletHealth:
+def check_wallet(address: str, force: bool = False) -> WalletHealth:
     """Check a wallet's balance and health."""
-    return wallet_monitor.check_wallet(address)
+    return wallet_monitor.check_wallet(address, force)
 
 
 def check_wallets(addresses: List[str]) -> Dict[str, WalletHealth]:
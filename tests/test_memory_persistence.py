@@ -4,14 +4,17 @@ Tests for Memory Persistence Module
 
 import pytest
 import asyncio
+import hashlib
 import json
 import os
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
 # Add src to path
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import memory_persistence
 from memory_persistence import (
     MemoryPersistence,
     MemorySnapshot,
@@ -49,6 +52,23 @@ class TestMemorySnapshot:
         restored = MemorySnapshot.from_json(json_str)
         assert restored.agent_id == snapshot.agent_id
         assert restored.data == snapshot.data
+    
+    @pytest.mark.parametrize("data", [
+        {"big": 2 ** 70, "negative": -(2 ** 65)},
+        {"ratio": float("nan")},
+        {"limits": [float("inf"), float("-inf")]},
+        {"nested": {"values": [1, 18446744073709551615, 2 ** 64]}},
+    ])
+    def test_save_restore_outside_orjson_range(self, data, tmp_path):
+        manager = MemoryPersistence(agent_id="test-agent")
+        snapshot = manager.create_snapshot(data)
+        path = str(tmp_path / "snapshot.json")
+        
+        assert manager.save_to_local(snapshot, path)
+        restored = manager.load_from_local(path)
+        assert restored is not None
+        assert manager.verify_integrity(restored)
+        assert json.dumps(restored.data) == json.dumps(data)
 
 
 class TestMemoryPersistence:
@@ -127,6 +147,102 @@ class TestMemoryPersistence:
         assert manager.get_snapshot_by_version(99) is None
 
 
+class TestChecksumAlgorithm:
+    """Test that snapshots verify with the algorithm that produced them"""
+    
+    @pytest.fixture
+    def fake_xxhash(self, monkeypatch):
+        # Stand-in with the same 16-hex-char output; xxhash may not be installed
+        fake = SimpleNamespace(
+            xxh3_64_hexdigest=lambda payload: hashlib.blake2b(payload, digest_size=8).hexdigest()
+        )
+        monkeypatch.setattr(memory_persistence, "xxhash", fake, raising=False)
+        monkeypatch.setattr(memory_persistence, "XXHASH_AVAILABLE", True)
+    
+    def test_snapshot_records_algorithm(self):
+        manager = MemoryPersistence(agent_id="test")
+        snapshot = manager.create_snapshot({"k": "v"})
+        assert snapshot.checksum_algorithm == "sha256"
+    
+    def test_verify_with_other_manager_algorithm(self, fake_xxhash):
+        xxh3_manager = MemoryPersistence(agent_id="test", checksum_algorithm="xxh3")
+        sha_manager = MemoryPersistence(agent_id="test")
+        xxh3_snapshot = xxh3_manager.create_snapshot({"important": "data"})
+        sha_snapshot = sha_manager.create_snapshot({"important": "data"})
+        
+        assert xxh3_snapshot.checksum_algorithm == "xxh3"
+        assert xxh3_snapshot.checksum != sha_snapshot.checksum
+        assert sha_manager.verify_integrity(xxh3_snapshot) == True
+        assert xxh3_manager.verify_integrity(sha_snapshot) == True
+        
+        xxh3_snapshot.data["important"] = "tampered"
+        assert sha_manager.verify_integrity(xxh3_snapshot) == False
+    
+    def test_algorithm_survives_json_roundtrip(self, fake_xxhash):
+        manager = MemoryPersistence(agent_id="test", checksum_algorithm="xxh3")
+        snapshot = manager.create_snapshot({"k": "v"})
+        restored = MemorySnapshot.from_json(snapshot.to_json())
+        
+        assert restored.checksum_algorithm == "xxh3"
+        assert MemoryPersistence(agent_id="test").verify_integrity(restored) == True
+    
+    def test_legacy_json_defaults_to_sha256(self):
+        manager = MemoryPersistence(agent_id="test")
+        snapshot = manager.create_snapshot({"k": "v"})
+        legacy = json.loads(snapshot.to_json())
+        del legacy["checksum_algorithm"]
+        
+        restored = MemorySnapshot.from_json(json.dumps(legacy))
+        assert restored.checksum_algorithm == "sha256"
+        assert manager.verify_integrity(restored) == True
+    
+    def test_unknown_algorithm_rejected(self):
+        with pytest.raises(ValueError):
+            MemoryPersistence(agent_id="test", checksum_algorithm="md5")
+        
+        manager = MemoryPersistence(agent_id="test")
+        snapshot = manager.create_snapshot({"k": "v"})
+        snapshot.checksum_algorithm = "md5"
+        with pytest.raises(ValueError):
+            manager.verify_integrity(snapshot)
+
+
+class TestMaxHistory:
+    """Test the bounded in-memory snapshot history"""
+    
+    def test_oldest_snapshots_evicted(self):
+        manager = MemoryPersistence(agent_id="test", max_history=3)
+        snapshots = [manager.create_snapshot({"v": i}) for i in range(5)]
+        
+        assert list(manager.snapshots) == snapshots[2:]
+        assert manager.get_snapshot_by_version(1) is None
+        assert manager.get_snapshot_by_version(2) is None
+        assert manager.get_snapshot_by_version(3) == snapshots[2]
+        assert manager.get_latest_snapshot() == snapshots[4]
+        assert manager.version == 5
+    
+    def test_index_tracks_history(self):
+        manager = MemoryPersistence(agent_id="test", max_history=2)
+        for i in range(10):
+            manager.create_snapshot({"v": i})
+        assert sorted(manager._by_version) == [9, 10]
+    
+    def test_default_bound(self):
+        manager = MemoryPersistence(agent_id="test")
+        assert manager.snapshots.maxlen == 1024
+    
+    def test_unbounded(self):
+        manager = MemoryPersistence(agent_id="test", max_history=None)
+        for i in range(1100):
+            manager.create_snapshot({"v": i})
+        assert len(manager.snapshots) == 1100
+        assert manager.get_snapshot_by_version(1).data == {"v": 0}
+    
+    def test_invalid_bound_rejected(self):
+        with pytest.raises(ValueError):
+            MemoryPersistence(agent_id="test", max_history=0)
+
+
 class TestAgentMedicMemoryManager:
     """Test convenience function"""
     
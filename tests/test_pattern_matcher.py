@@ -0,0 +1,222 @@
+"""
+Tests for Pattern Matcher
+"""
+
+import pytest
+import os
+import random
+import re
+import stat
+import threading
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pattern_matcher
+from pattern_matcher import PatternSet, HYPERSCAN_AVAILABLE
+
+
+requires_hyperscan = pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+
+SOLANA_KEY = "5" * 88
+
+# Fragments that exercise the scanner patterns plus non-ASCII look-alikes
+# (long s, Kelvin sign, Arabic-Indic digits, fullwidth letters, ...)
+FUZZ_FRAGMENTS = [
+    "secret", "\u017fecret", "SECRET", "privateKey", "key", "KEY", "\u212aey", "\u00e9",
+    " ", "=", ":", "'", '"', "0x", "approve", "123456789",
+    "\u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669", "free", "sol", "airdrop",
+    "claim", "verify", "wallet", "at", ".scam.", "POST", "send", "private", "upload", "seed",
+    "body", "\n", "\t", "\u00a0", "\u2003", "\x0b", "\x1c", "-----BEGIN", "PRIVATE KEY-----",
+    "ignore", "previous", "instructions", "forget", "you", "are", "now", "dan", "mode",
+    "\uff21", "a", "_", "\u00df", "DRAINER", "setApprovalForAll", "true", "unlimited", SOLANA_KEY,
+]
+
+
+def _scanner_sets():
+    import security_scanner
+    import self_protection
+    return [
+        security_scanner._PRIVATE_KEY_SET,
+        security_scanner._DRAINER_SET,
+        security_scanner._PHISHING_SET,
+        security_scanner._EXFIL_SET,
+        self_protection._INJECTION_SET,
+        self_protection._MANIPULATION_SET,
+    ]
+
+
+class TestBackendSemantics:
+    """Test the re backend's ASCII matching rules"""
+
+    def test_word_boundary_before_non_ascii(self):
+        keys = PatternSet([r"\b[1-9A-HJ-NP-Za-km-z]{87,88}\b"], re.IGNORECASE)
+        assert keys._first_match_re(SOLANA_KEY + "\u00e9") is not None
+
+    def test_no_unicode_case_folding(self):
+        secrets = PatternSet([r"secret[\s:=]+'x'"], re.IGNORECASE)
+        assert secrets._first_match_re("SECRET='x'") is not None
+        assert secrets._first_match_re("\u017fecret='x'") is None
+
+    def test_digits_are_ascii(self):
+        approvals = PatternSet([r"approve.*\d{9,}"], re.IGNORECASE)
+        assert approvals._first_match_re("approve 123456789") is not None
+        assert approvals._first_match_re("approve \u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669") is None
+
+
+class TestBackendParity:
+    """Test that the Hyperscan and re backends agree"""
+
+    @requires_hyperscan
+    @pytest.mark.parametrize("text", [
+        SOLANA_KEY + "\u00e9",
+        "\u017fecret='x'",
+        "approve \u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669",
+        "\u212aey",
+    ])
+    def test_known_divergences(self, text):
+        for pattern_set in _scanner_sets():
+            db = pattern_set._get_hs_db()
+            assert db
+            assert pattern_set._first_match_re(text) == pattern_set._first_match_hyperscan(db, text)
+
+    @requires_hyperscan
+    def test_fuzz_parity(self):
+        rng = random.Random(1234)
+        pattern_sets = [(s, s._get_hs_db()) for s in _scanner_sets()]
+        mismatches = []
+        for _ in range(3000):
+            text = "".join(rng.choice(FUZZ_FRAGMENTS) for _ in range(rng.randint(1, 8)))
+            for pattern_set, db in pattern_sets:
+                expected = pattern_set._first_match_re(text)
+                actual = pattern_set._first_match_hyperscan(db, text)
+                if expected != actual:
+                    mismatches.append((text, expected, actual))
+        assert mismatches == []
+
+
+class TestHyperscanCache:
+    """Test the on-disk Hyperscan database cache"""
+
+    @pytest.fixture
+    def cache_home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        return tmp_path / "agentmedic" / "hyperscan"
+
+    @pytest.fixture
+    def loads(self, monkeypatch):
+        calls = []
+        real_loadb = pattern_matcher.hyperscan.loadb
+
+        def loadb(*args, **kwargs):
+            calls.append(args)
+            return real_loadb(*args, **kwargs)
+
+        monkeypatch.setattr(pattern_matcher.hyperscan, "loadb", loadb)
+        return calls
+
+    @requires_hyperscan
+    def test_cache_is_private(self, cache_home):
+        assert PatternSet([r"abc\d+"]).first_match("xabc12") == r"abc\d+"
+
+        assert stat.S_IMODE(cache_home.stat().st_mode) == 0o700
+        files = list(cache_home.glob("*.hsdb"))
+        assert len(files) == 1
+        assert stat.S_IMODE(files[0].stat().st_mode) & 0o077 == 0
+
+    @requires_hyperscan
+    def test_cached_database_reused(self, cache_home, loads):
+        PatternSet([r"abc\d+"]).first_match("abc1")
+        assert PatternSet([r"abc\d+"]).first_match("abc1") == r"abc\d+"
+        assert len(loads) == 1
+
+    @requires_hyperscan
+    def test_loose_mode_cache_ignored(self, cache_home, loads):
+        PatternSet([r"abc\d+"]).first_match("abc1")
+        (cache_file,) = cache_home.glob("*.hsdb")
+        os.chmod(cache_file, 0o666)
+
+        assert PatternSet([r"abc\d+"]).first_match("abc1") == r"abc\d+"
+        assert loads == []
+
+    @requires_hyperscan
+    def test_foreign_owner_cache_ignored(self, cache_home, loads, monkeypatch):
+        PatternSet([r"abc\d+"]).first_match("abc1")
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(cache_home).st_uid + 1)
+
+        assert PatternSet([r"abc\d+"]).first_match("abc1") == r"abc\d+"
+        assert loads == []
+
+    @requires_hyperscan
+    def test_symlinked_cache_ignored(self, cache_home, loads, tmp_path):
+        PatternSet([r"abc\d+"]).first_match("abc1")
+        (cache_file,) = cache_home.glob("*.hsdb")
+        target = tmp_path / "elsewhere.hsdb"
+        cache_file.rename(target)
+        cache_file.symlink_to(target)
+
+        assert PatternSet([r"abc\d+"]).first_match("abc1") == r"abc\d+"
+        assert loads == []
+
+
+class TestThreadSafety:
+    """Test one PatternSet shared by many threads"""
+
+    THREADS = 8
+
+    def _run_threads(self, target):
+        errors = []
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    @requires_hyperscan
+    def test_concurrent_scans(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        pattern_set = PatternSet([r"needle\d+", r"free.*airdrop"], re.IGNORECASE)
+        assert pattern_set._get_hs_db()
+        text = "hay " * 20000 + "free airdrop"
+        results = []
+
+        def scan():
+            for _ in range(20):
+                results.append(pattern_set.first_match(text))
+
+        assert self._run_threads(scan) == []
+        assert results == [r"free.*airdrop"] * (self.THREADS * 20)
+
+    @requires_hyperscan
+    def test_database_built_once(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        pattern_set = PatternSet([r"abc\d+"])
+        builds = []
+        real_compile = pattern_set._compile_hs_db
+        barrier = threading.Barrier(self.THREADS)
+
+        def compile_hs_db():
+            builds.append(1)
+            return real_compile()
+
+        monkeypatch.setattr(pattern_set, "_compile_hs_db", compile_hs_db)
+
+        def first_use():
+            barrier.wait()
+            assert pattern_set.first_match("abc1") == r"abc\d+"
+
+        assert self._run_threads(first_use) == []
+        assert len(builds) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,46 @@
+"""
+Tests for Recoverer
+"""
+
+import pytest
+import json
+import os
+from dataclasses import asdict
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from recoverer import (
+    Recoverer,
+    RecoveryAction,
+    RecoveryPlan,
+    RecoveryStatus
+)
+
+
+class TestRecoveryResultDetails:
+    """Test that results stay plain serializable data"""
+
+    @pytest.mark.parametrize("action", [RecoveryAction.NO_ACTION, RecoveryAction.ALERT_HUMAN])
+    def test_result_serializes(self, action):
+        plan = RecoveryPlan(incident_id="inc-1", action=action, agent_name=None, reason="test")
+        result = Recoverer().execute(plan)
+
+        assert result.status == RecoveryStatus.SKIPPED
+        assert type(result.details) is dict
+        assert asdict(result)["details"] == result.details
+        json.dumps(result.details)
+
+    def test_empty_details_not_shared(self):
+        plan = RecoveryPlan(incident_id="inc-1", action=RecoveryAction.NO_ACTION, agent_name=None)
+        recoverer = Recoverer()
+        first = recoverer.execute(plan)
+        second = recoverer.execute(plan)
+
+        first.details["note"] = "added later"
+        assert second.details == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
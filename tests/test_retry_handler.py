@@ -0,0 +1,62 @@
+"""
+Tests for Retry Handler
+"""
+
+import pytest
+import asyncio
+import os
+from types import SimpleNamespace
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from retry_handler import RetryConfig, retry_on_status
+
+
+def _sender(*statuses):
+    """send() that returns responses with the given status codes in turn."""
+    responses = [SimpleNamespace(status_code=code) for code in statuses]
+    calls = []
+
+    async def send():
+        calls.append(1)
+        return responses[len(calls) - 1]
+
+    return send, calls
+
+
+NO_DELAY = dict(base_delay=0, max_delay=0, jitter=False)
+
+
+class TestRetryOnStatus:
+    """Test resending on retryable status codes"""
+
+    def test_retries_until_success(self):
+        send, calls = _sender(429, 429, 200)
+        response = asyncio.run(retry_on_status(send, RetryConfig(max_attempts=3, **NO_DELAY)))
+        assert response.status_code == 200
+        assert len(calls) == 3
+
+    def test_last_response_returned_when_attempts_run_out(self):
+        send, calls = _sender(429, 429)
+        response = asyncio.run(retry_on_status(send, RetryConfig(max_attempts=2, **NO_DELAY)))
+        assert response.status_code == 429
+        assert len(calls) == 2
+
+    def test_single_attempt(self):
+        send, calls = _sender(429)
+        response = asyncio.run(retry_on_status(send, RetryConfig(max_attempts=1, **NO_DELAY)))
+        assert response.status_code == 429
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("max_attempts", [0, -1])
+    def test_no_attempts_rejected(self, max_attempts):
+        send, calls = _sender(200)
+        with pytest.raises(ValueError):
+            asyncio.run(retry_on_status(send, RetryConfig(max_attempts=max_attempts)))
+        assert calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,211 @@
+"""
+Tests for Security Scanner
+"""
+
+import pytest
+import json
+import os
+from dataclasses import asdict
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+from collections import Counter
+
+import security_scanner
+from security_scanner import SecurityScanner, SecurityAlert, ThreatLevel
+
+
+def _alert_types(alerts):
+    return [alert.threat_type for alert in alerts]
+
+
+def _alert(level, name="TEST"):
+    return SecurityAlert(
+        threat_type=name,
+        threat_level=level,
+        description="",
+        details={},
+        recommendation=""
+    )
+
+
+class TestRpcConfig:
+    """Test RPC endpoint checks"""
+
+    @pytest.mark.parametrize("endpoint", [
+        "http://localhost:8899",
+        "http://LOCALHOST:8899",
+        "http://127.0.0.1:8899",
+        "http://[::1]:8899",
+        "http://user@localhost:8899",
+    ])
+    def test_local_http_allowed(self, endpoint):
+        alerts = SecurityScanner().scan_rpc_config([endpoint])
+        assert "INSECURE_RPC" not in _alert_types(alerts)
+
+    @pytest.mark.parametrize("endpoint", [
+        "http://localhost.evil.com",
+        "http://localhost@evil.com",
+        "http://localhost-x.evil.com",
+        "http://evil.com/localhost",
+        "HTTP://evil.com",
+        "http://[::1",
+    ])
+    def test_remote_http_flagged(self, endpoint):
+        alerts = SecurityScanner().scan_rpc_config([endpoint])
+        assert "INSECURE_RPC" in _alert_types(alerts)
+
+    def test_https_not_flagged(self):
+        alerts = SecurityScanner().scan_rpc_config(["https://api.devnet.solana.com"])
+        assert alerts == []
+
+
+class TestCollectDetails:
+    """Test alerts built without details"""
+
+    def test_alerts_without_details_serialize(self):
+        scanner = SecurityScanner(collect_details=False)
+        alerts = scanner.scan_text("claim your airdrop now")
+        alerts += scanner.scan_rpc_config(["http://evil.com"])
+        alerts += scanner.scan_transaction({"amount": 50, "direction": "out", "program_age_days": 1})
+
+        assert len(alerts) == 5
+        for alert in alerts:
+            assert alert.details == {}
+            assert asdict(alert)["details"] == {}
+            json.dumps(alert.details)
+
+    def test_empty_details_not_shared(self):
+        scanner = SecurityScanner(collect_details=False)
+        first, second = scanner.scan_rpc_config(["http://evil.com"])
+        first.details["note"] = "added later"
+        assert second.details == {}
+
+
+class TestWindowedScan:
+    """Test scanning of texts longer than MAX_SCAN_LEN"""
+
+    @pytest.fixture
+    def small_windows(self, monkeypatch):
+        monkeypatch.setattr(security_scanner, "MAX_SCAN_LEN", 1000)
+        monkeypatch.setattr(security_scanner, "MAX_CACHED_TEXT_LEN", 100)
+        return 1000
+
+    def _padding(self, length):
+        return ("log line ok\n" * (length // 12 + 1))[:length]
+
+    def test_windows_end_at_line_breaks(self, small_windows):
+        text = self._padding(5000)
+        windows = list(security_scanner._scan_windows(text))
+        assert "".join(windows) == text
+        assert all(len(w) <= small_windows and w.endswith("\n") for w in windows[:-1])
+
+    def test_long_line_kept_whole(self, small_windows):
+        line = "x" * 3000
+        text = self._padding(500) + line + "\n" + self._padding(500)
+        windows = list(security_scanner._scan_windows(text))
+        assert "".join(windows) == text
+        assert any(line in w for w in windows)
+
+    def test_pem_across_window_edge(self, small_windows):
+        pem = "-----BEGIN " + "A" * 1500 + " PRIVATE KEY-----"
+        text = self._padding(900) + pem + "\n" + self._padding(900)
+        alerts = SecurityScanner().scan_text(text)
+        assert "EXPOSED_KEY" in _alert_types(alerts)
+
+    def test_phishing_across_window_edge(self, small_windows):
+        lure = "free 100 " + "x" * 1200 + " sol airdrop"
+        text = self._padding(950) + lure + "\n" + self._padding(950)
+        alerts = SecurityScanner().scan_text(text)
+        assert "PHISHING" in _alert_types(alerts)
+
+    def test_long_token_not_split_into_key(self, small_windows):
+        # A 137-char base58 run is not a key; cutting its first 49 chars off must not make one
+        text = self._padding(950) + "\n" + "A" * 137 + "\n" + self._padding(950)
+        alerts = SecurityScanner().scan_text(text)
+        assert "EXPOSED_KEY" not in _alert_types(alerts)
+
+    def test_same_alerts_as_full_scan(self, small_windows):
+        text = self._padding(2000) + "claim your airdrop\n" + self._padding(2000) + "upload seed\n"
+        windowed = security_scanner._match_text_windowed(text)
+        assert windowed == security_scanner._match_text.__wrapped__(text)
+
+
+class TestAlertHistory:
+    """Test the bounded alert history and its per-level counts"""
+
+    def test_history_bounded(self):
+        scanner = SecurityScanner(max_alerts=3)
+        scanner._record_alerts(_alert(ThreatLevel.LOW, f"A{i}") for i in range(5))
+        assert [a.threat_type for a in scanner.alerts] == ["A2", "A3", "A4"]
+        assert scanner.get_summary()["total_alerts"] == 3
+
+    def test_counts_follow_evictions(self):
+        scanner = SecurityScanner(max_alerts=2)
+        scanner._record_alerts([_alert(ThreatLevel.CRITICAL), _alert(ThreatLevel.LOW), _alert(ThreatLevel.LOW)])
+        summary = scanner.get_summary()
+        assert summary["by_level"] == {"low": 2}
+        assert summary["critical_count"] == 0
+
+    def test_counts_match_recount(self):
+        rng = random.Random(7)
+        levels = list(ThreatLevel)
+        scanner = SecurityScanner(max_alerts=50)
+        for _ in range(40):
+            scanner._record_alerts(_alert(rng.choice(levels)) for _ in range(rng.randint(0, 9)))
+            expected = Counter(a.threat_level.value for a in scanner.alerts)
+            summary = scanner.get_summary()
+            assert summary["by_level"] == dict(expected)
+            assert summary["critical_count"] == expected["critical"]
+            assert summary["high_count"] == expected["high"]
+
+    def test_scans_recorded(self):
+        scanner = SecurityScanner(max_alerts=4)
+        for _ in range(3):
+            scanner.scan_rpc_config(["http://evil.com"])
+        assert len(scanner.alerts) == 4
+        assert sum(scanner.get_summary()["by_level"].values()) == 4
+
+
+class TestCriticalAlerts:
+    """Test the incrementally kept CRITICAL/HIGH list"""
+
+    SEVERE = (ThreatLevel.CRITICAL, ThreatLevel.HIGH)
+
+    def test_only_severe_returned(self):
+        scanner = SecurityScanner()
+        alerts = [_alert(level, level.value) for level in ThreatLevel]
+        scanner._record_alerts(alerts)
+        assert [a.threat_type for a in scanner.get_critical_alerts()] == ["high", "critical"]
+
+    def test_evicted_severe_alert_dropped(self):
+        scanner = SecurityScanner(max_alerts=3)
+        scanner._record_alerts([
+            _alert(ThreatLevel.CRITICAL, "old"),
+            _alert(ThreatLevel.LOW),
+            _alert(ThreatLevel.HIGH, "new"),
+            _alert(ThreatLevel.INFO),
+        ])
+        assert [a.threat_type for a in scanner.get_critical_alerts()] == ["new"]
+
+    def test_matches_filtered_history(self):
+        rng = random.Random(11)
+        levels = list(ThreatLevel)
+        scanner = SecurityScanner(max_alerts=30)
+        for i in range(200):
+            scanner._record_alerts([_alert(rng.choice(levels), f"A{i}")])
+            expected = [a for a in scanner.alerts if a.threat_level in self.SEVERE]
+            assert scanner.get_critical_alerts() == expected
+
+    def test_returns_copy(self):
+        scanner = SecurityScanner()
+        scanner._record_alerts([_alert(ThreatLevel.CRITICAL)])
+        scanner.get_critical_alerts().clear()
+        assert len(scanner.get_critical_alerts()) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+"""
+Tests for Self Protection
+"""
+
+import pytest
+import os
+import random
+import re
+import time
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from self_protection import SelfProtection
+
+
+class TestResourceHeavy:
+    """Test the linear-time resource exhaustion check"""
+
+    def test_long_text(self):
+        protection = SelfProtection()
+        assert protection.is_resource_heavy("x" * (SelfProtection.RESOURCE_MAX_LENGTH + 1))
+        assert not protection.is_resource_heavy("x" * SelfProtection.RESOURCE_MAX_LENGTH)
+
+    def test_word_count(self):
+        protection = SelfProtection()
+        assert protection.is_resource_heavy("w " * (SelfProtection.RESOURCE_MAX_WORDS + 1))
+        assert not protection.is_resource_heavy("w " * SelfProtection.RESOURCE_MAX_WORDS)
+
+    def test_words_counted_not_characters(self):
+        assert not SelfProtection().is_resource_heavy("a" * 5000)
+
+    def test_backtracking_input_is_fast(self):
+        # Input that sends the old (\w+\s*){1000,} pattern into exponential backtracking
+        text = "ab " * 400 + "-" + "ab " * 400
+        start = time.perf_counter()
+        assert not SelfProtection().is_resource_heavy(text)
+        assert time.perf_counter() - start < 0.5
+
+
+def _reference_sanitize(text, limit):
+    """The original strip-then-truncate implementation."""
+    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    return text[:limit]
+
+
+class TestSanitizeInput:
+    """Test control character removal and chunked truncation"""
+
+    def test_strips_control_characters(self):
+        protection = SelfProtection()
+        assert protection.sanitize_input("a\x00b\x07c\x1bd\x7f") == "abcd"
+
+    def test_keeps_whitespace_and_non_ascii(self):
+        text = "line\nnext\ttab\rcr \u00e9\u4e2d\U0001f600 \ud800"
+        assert SelfProtection().sanitize_input(text) == text
+
+    def test_truncates_to_limit(self):
+        protection = SelfProtection(max_input_length=10)
+        assert protection.sanitize_input("x" * 25) == "x" * 10
+
+    def test_limit_filled_after_stripping(self):
+        # The first limit characters are mostly control characters, so later
+        # chunks must be filtered to fill the output
+        protection = SelfProtection(max_input_length=10)
+        text = "\x00" * 8 + "ab" + "\x01c" * 20
+        assert protection.sanitize_input(text) == "ab" + "c" * 8
+
+    def test_matches_reference(self):
+        rng = random.Random(5)
+        alphabet = ["a", "\u00e9", "\n", "\t", "\x00", "\x1f", "\x7f", "\U0001f600", " "]
+        for _ in range(500):
+            limit = rng.randint(1, 40)
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+            protection = SelfProtection(max_input_length=limit)
+            assert protection.sanitize_input(text) == _reference_sanitize(text, limit)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
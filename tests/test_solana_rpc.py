@@ -0,0 +1,124 @@
+"""
+Tests for Solana RPC
+"""
+
+import pytest
+import os
+import random
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import solana_rpc
+
+
+CALLS = [("getSlot", []), ("getBalance", ["a"]), ("getBalance", ["b"]), ("getEpochInfo", [])]
+
+
+@pytest.fixture
+def post(monkeypatch):
+    """Patch _post_json with a server that answers through the given reply function."""
+    sent = []
+
+    def install(reply):
+        def post_json(rpc_url, payload):
+            sent.append(payload)
+            return reply(payload)
+
+        monkeypatch.setattr(solana_rpc, "_post_json", post_json)
+        return sent
+
+    return install
+
+
+def _answer(request):
+    return {"jsonrpc": "2.0", "id": request["id"], "result": [request["method"], request["params"]]}
+
+
+class TestRpcBatch:
+    """Test matching batched JSON-RPC replies to their calls"""
+
+    def test_ids_follow_call_order(self, post):
+        sent = post(lambda payload: [_answer(r) for r in payload])
+        solana_rpc._rpc_batch(CALLS)
+        assert [r["id"] for r in sent[0]] == [0, 1, 2, 3]
+
+    def test_in_order_replies(self, post):
+        post(lambda payload: [_answer(r) for r in payload])
+        responses = solana_rpc._rpc_batch(CALLS)
+        assert [r["result"] for r in responses] == [[m, p] for m, p in CALLS]
+
+    def test_shuffled_replies_matched_by_id(self, post):
+        def reply(payload):
+            replies = [_answer(r) for r in payload]
+            random.Random(3).shuffle(replies)
+            return replies
+
+        post(reply)
+        responses = solana_rpc._rpc_batch(CALLS)
+        assert [r["result"] for r in responses] == [[m, p] for m, p in CALLS]
+
+    def test_missing_reply_is_error(self, post):
+        post(lambda payload: [_answer(r) for r in payload if r["id"] != 2])
+        responses = solana_rpc._rpc_batch(CALLS)
+        assert "error" in responses[2]
+        assert [r["result"] for i, r in enumerate(responses) if i != 2] == \
+            [[m, p] for i, (m, p) in enumerate(CALLS) if i != 2]
+
+    def test_per_call_error_kept(self, post):
+        def reply(payload):
+            replies = [_answer(r) for r in payload]
+            replies[1] = {"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "bad"}}
+            return replies
+
+        post(reply)
+        responses = solana_rpc._rpc_batch(CALLS)
+        assert responses[1]["error"]["code"] == -32602
+        assert "result" in responses[0] and "result" in responses[2]
+
+    def test_rejected_batch_error_repeated(self, post):
+        error = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}}
+        post(lambda payload: error)
+        assert solana_rpc._rpc_batch(CALLS) == [error] * len(CALLS)
+
+    def test_invalid_reply(self, post):
+        post(lambda payload: "garbage")
+        responses = solana_rpc._rpc_batch(CALLS)
+        assert len(responses) == len(CALLS)
+        assert all("error" in r for r in responses)
+
+    def test_transport_error(self, post):
+        def reply(payload):
+            raise ConnectionError("refused")
+
+        post(reply)
+        responses = solana_rpc._rpc_batch(CALLS)
+        assert responses == [{"error": {"message": "refused"}}] * len(CALLS)
+
+    def test_empty_batch_not_sent(self, post):
+        sent = post(lambda payload: [])
+        assert solana_rpc._rpc_batch([]) == []
+        assert sent == []
+
+    def test_mainnet_write_rejected_before_sending(self, post):
+        sent = post(lambda payload: [_answer(r) for r in payload])
+        with pytest.raises(PermissionError):
+            solana_rpc._rpc_batch([("getSlot", []), ("sendTransaction", ["tx"])], solana_rpc.MAINNET_RPC)
+        assert sent == []
+
+    def test_transactions_matched_to_signatures(self, post):
+        def reply(payload):
+            replies = [
+                {"id": r["id"], "result": {"slot": r["id"], "meta": {"err": None}}}
+                for r in payload
+            ]
+            return list(reversed(replies))
+
+        post(reply)
+        results = solana_rpc.get_transactions(["sigA", "sigB", "sigC"])
+        assert [(t.signature, t.slot) for t in results] == [("sigA", 0), ("sigB", 1), ("sigC", 2)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+Tests for SolanaScope Integration
+"""
+
+import pytest
+import asyncio
+import gc
+import os
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import solanascope_integration
+from solanascope_integration import SolanaScope, close_scope, get_scope
+
+
+class TestClientLifecycle:
+    """Test the per-event-loop HTTP clients"""
+
+    def test_client_reused_within_loop(self):
+        scope = SolanaScope()
+
+        async def run():
+            first = await scope._get_client()
+            assert await scope._get_client() is first
+            await scope.close()
+            assert first.is_closed
+
+        asyncio.run(run())
+
+    def test_clients_released_with_their_loop(self):
+        scope = SolanaScope()
+        clients = []
+
+        async def run():
+            clients.append(await scope._get_client())
+
+        for _ in range(3):
+            asyncio.run(run())
+        gc.collect()
+
+        assert len({id(client) for client in clients}) == 3
+        assert len(scope._clients) == 0
+
+    def test_close_scope(self, monkeypatch):
+        monkeypatch.setattr(solanascope_integration, "_scope", None)
+
+        async def run():
+            scope = get_scope()
+            client = await scope._get_client()
+            await close_scope()
+            assert client.is_closed
+            assert get_scope() is not scope
+            await close_scope()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
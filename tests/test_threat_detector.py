@@ -0,0 +1,354 @@
+"""
+Tests for Threat Detector
+"""
+
+import pytest
+import asyncio
+import json
+import os
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import solana_rpc
+import threat_detector
+from threat_detector import (
+    Blacklist,
+    ThreatDetector,
+    ThreatType,
+    involved_addresses
+)
+
+
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+PAYER = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+RECIPIENT = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+CUSTOM_PROGRAM = "HUBsveNpjo5pWqNkH57QzxjQASdTVXcSK7bVKTSZtcSX"
+FAILED_SIG = "5" * 88
+
+
+def _system_transfer_tx():
+    return solana_rpc.TransactionResult(
+        signature=FAILED_SIG,
+        status=solana_rpc.TransactionStatus.FAILED,
+        error="{'InstructionError': [0, {'Custom': 1}]}",
+        logs=[
+            f"Program {SYSTEM_PROGRAM} invoke [1]",
+            "Transfer: insufficient lamports 0, need 1000",
+            f"Program {SYSTEM_PROGRAM} failed: custom program error: 0x1"
+        ],
+        account_keys=[PAYER, RECIPIENT, SYSTEM_PROGRAM],
+        program_ids=[SYSTEM_PROGRAM],
+        num_signers=1
+    )
+
+
+def _busy_history(address, limit=10, rpc_url=None):
+    # Every address looks busy enough to trip the drain heuristic
+    return [{"signature": f"sig{i}", "err": None} for i in range(limit)]
+
+
+EVIDENCE = {"transactions": {"failures": [{"signature": FAILED_SIG}]}}
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return ThreatDetector(blacklist_file=str(tmp_path / "blacklist.json"))
+
+
+class TestInvolvedAddresses:
+    """Test candidate address selection"""
+
+    def test_excludes_system_program_from_logs(self):
+        tx = solana_rpc.TransactionResult(
+            signature=FAILED_SIG,
+            status=solana_rpc.TransactionStatus.FAILED,
+            logs=[f"Program {SYSTEM_PROGRAM} invoke [1]"],
+            account_keys=[PAYER, RECIPIENT, SYSTEM_PROGRAM]
+        )
+        assert involved_addresses([tx]) == [RECIPIENT]
+
+    def test_excludes_invoked_programs(self):
+        tx = solana_rpc.TransactionResult(
+            signature=FAILED_SIG,
+            status=solana_rpc.TransactionStatus.FAILED,
+            logs=[
+                f"Program {CUSTOM_PROGRAM} invoke [1]",
+                f"Program {SYSTEM_PROGRAM} invoke [2]"
+            ],
+            account_keys=[PAYER, RECIPIENT, CUSTOM_PROGRAM, SYSTEM_PROGRAM]
+        )
+        assert involved_addresses([tx]) == [RECIPIENT]
+
+    def test_excludes_instruction_programs(self):
+        tx = solana_rpc.TransactionResult(
+            signature=FAILED_SIG,
+            status=solana_rpc.TransactionStatus.FAILED,
+            account_keys=[PAYER, RECIPIENT, CUSTOM_PROGRAM],
+            program_ids=[CUSTOM_PROGRAM]
+        )
+        assert involved_addresses([tx]) == [RECIPIENT]
+
+    def test_excludes_signers(self):
+        co_signer = CUSTOM_PROGRAM
+        tx = solana_rpc.TransactionResult(
+            signature=FAILED_SIG,
+            status=solana_rpc.TransactionStatus.FAILED,
+            account_keys=[PAYER, co_signer, RECIPIENT, SYSTEM_PROGRAM],
+            num_signers=2
+        )
+        assert involved_addresses([tx]) == [RECIPIENT]
+
+    def test_parsed_header_signers(self):
+        response = {"result": {
+            "transaction": {"message": {
+                "header": {"numRequiredSignatures": 1},
+                "accountKeys": [PAYER, RECIPIENT, SYSTEM_PROGRAM],
+                "instructions": [{"programIdIndex": 2}]
+            }},
+            "meta": {"err": None}
+        }}
+        tx = solana_rpc._parse_transaction(FAILED_SIG, response)
+        assert tx.num_signers == 1
+        assert involved_addresses([tx]) == [RECIPIENT]
+
+    def test_log_text_is_not_an_address_source(self):
+        tx = solana_rpc.TransactionResult(
+            signature=FAILED_SIG,
+            status=solana_rpc.TransactionStatus.FAILED,
+            logs=[f"Program log: transfer to {RECIPIENT}"]
+        )
+        assert involved_addresses([tx]) == []
+
+
+class TestAnalyzeIncident:
+    """Test incident analysis against busy programs"""
+
+    def test_system_program_not_flagged(self, detector, monkeypatch):
+        checked = []
+
+        def history(address, limit=10, rpc_url=None):
+            checked.append(address)
+            if address == SYSTEM_PROGRAM:
+                return _busy_history(address, limit)
+            return []
+
+        monkeypatch.setattr(solana_rpc, "get_transactions", lambda sigs, rpc_url=None: [_system_transfer_tx()])
+        monkeypatch.setattr(solana_rpc, "get_signatures_for_address", history)
+
+        assert detector.analyze_incident(EVIDENCE) is None
+        assert checked == [RECIPIENT]
+
+    def test_system_program_not_flagged_async(self, detector, monkeypatch):
+        checked = []
+
+        async def get_transaction(sig, rpc_url=None):
+            return _system_transfer_tx()
+
+        async def history(address, limit=10, rpc_url=None):
+            checked.append(address)
+            return _busy_history(address, limit) if address == SYSTEM_PROGRAM else []
+
+        monkeypatch.setattr(solana_rpc, "get_transaction_async", get_transaction)
+        monkeypatch.setattr(solana_rpc, "get_signatures_for_address_async", history)
+
+        assert asyncio.run(detector.analyze_incident_async(EVIDENCE)) is None
+        assert SYSTEM_PROGRAM not in checked
+
+    def test_busy_counterparty_still_flagged(self, detector, monkeypatch):
+        def history(address, limit=10, rpc_url=None):
+            return _busy_history(address, limit) if address == RECIPIENT else []
+
+        monkeypatch.setattr(solana_rpc, "get_transactions", lambda sigs, rpc_url=None: [_system_transfer_tx()])
+        monkeypatch.setattr(solana_rpc, "get_signatures_for_address", history)
+
+        assessment = detector.analyze_incident(EVIDENCE)
+        assert assessment is not None
+        assert assessment.threat_type == ThreatType.SUSPICIOUS
+        assert assessment.address == RECIPIENT
+
+    def test_busy_payer_not_flagged(self, detector, monkeypatch):
+        checked = []
+
+        def history(address, limit=10, rpc_url=None):
+            checked.append(address)
+            return _busy_history(address, limit) if address == PAYER else []
+
+        monkeypatch.setattr(solana_rpc, "get_transactions", lambda sigs, rpc_url=None: [_system_transfer_tx()])
+        monkeypatch.setattr(solana_rpc, "get_signatures_for_address", history)
+
+        assert detector.analyze_incident(EVIDENCE) is None
+        assert PAYER not in checked
+
+    def test_blacklisted_system_program_is_ignored(self, detector, monkeypatch):
+        detector.blacklist.add(SYSTEM_PROGRAM)
+        monkeypatch.setattr(solana_rpc, "get_transactions", lambda sigs, rpc_url=None: [_system_transfer_tx()])
+        monkeypatch.setattr(solana_rpc, "get_signatures_for_address", lambda *a, **kw: [])
+
+        assert detector.analyze_incident(EVIDENCE) is None
+
+
+def _write_blacklist_json(path, addresses):
+    path.write_text(json.dumps({"addresses": addresses}))
+
+
+class TestBlacklist:
+    """Test the packed pubkey blacklist"""
+
+    def test_pubkeys_stored_as_bytes(self):
+        blacklist = Blacklist([PAYER, "not-a-pubkey"])
+        assert len(blacklist._keys) == 1
+        assert all(len(key) == 32 for key in blacklist._keys)
+        assert blacklist._other == {"not-a-pubkey"}
+        assert PAYER in blacklist
+        assert "not-a-pubkey" in blacklist
+        assert RECIPIENT not in blacklist
+        assert sorted(blacklist) == sorted([PAYER, "not-a-pubkey"])
+        assert not blacklist.keys_only
+
+    def test_packed_roundtrip(self):
+        blacklist = Blacklist([PAYER, RECIPIENT, SYSTEM_PROGRAM])
+        packed = blacklist.packed()
+        assert len(packed) == 3 * 32
+
+        restored = Blacklist()
+        restored.load_packed(packed)
+        assert sorted(restored) == sorted(blacklist)
+        assert restored.keys_only
+
+    def test_non_pubkey_lookup_without_keys(self):
+        blacklist = Blacklist(["scammer.example"])
+        assert "scammer.example" in blacklist
+        assert PAYER not in blacklist
+
+
+class TestBlacklistSnapshot:
+    """Test the mmap'd binary snapshot of the blacklist JSON"""
+
+    def test_snapshot_written_and_used(self, tmp_path, monkeypatch):
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [PAYER, RECIPIENT])
+        first = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert first.blacklist_snapshot.stat().st_size == 2 * 32
+
+        loads = []
+        real_load = ThreatDetector._load_snapshot
+        monkeypatch.setattr(ThreatDetector, "_load_snapshot", lambda self: loads.append(1) or real_load(self))
+        second = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert loads == [1]
+        assert PAYER in second.blacklist and RECIPIENT in second.blacklist
+
+    def test_stale_snapshot_ignored(self, tmp_path):
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [PAYER])
+        detector = ThreatDetector(blacklist_file=str(blacklist_file))
+
+        _write_blacklist_json(blacklist_file, [RECIPIENT])
+        stat = detector.blacklist_snapshot.stat()
+        os.utime(blacklist_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reloaded = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert RECIPIENT in reloaded.blacklist
+        assert PAYER not in reloaded.blacklist
+
+    def test_no_snapshot_for_non_pubkeys(self, tmp_path):
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [PAYER, "scammer.example"])
+        detector = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert not detector.blacklist_snapshot.exists()
+
+        reloaded = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert "scammer.example" in reloaded.blacklist
+        assert PAYER in reloaded.blacklist
+
+    def test_blacklisted_address_reported(self, tmp_path):
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [RECIPIENT])
+        ThreatDetector(blacklist_file=str(blacklist_file))
+        assessment = ThreatDetector(blacklist_file=str(blacklist_file)).check_address(RECIPIENT)
+        assert assessment.threat_type == ThreatType.KNOWN_SCAM
+
+
+class TestBlacklistLog:
+    """Test the append-only blacklist log and its compaction"""
+
+    def _log_lines(self, detector):
+        return detector.blacklist_log.read_text().splitlines()
+
+    def test_addition_appended_not_rewritten(self, tmp_path):
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [PAYER])
+        detector = ThreatDetector(blacklist_file=str(blacklist_file))
+        before = blacklist_file.read_text()
+
+        detector.add_to_blacklist(RECIPIENT, ThreatType.PHISHING, "test")
+        assert blacklist_file.read_text() == before
+        (line,) = self._log_lines(detector)
+        entry = json.loads(line)
+        assert entry["address"] == RECIPIENT
+        assert entry["threat_type"] == "phishing"
+        assert RECIPIENT in detector.blacklist
+
+    def test_log_replayed_on_load(self, tmp_path):
+        blacklist_file = tmp_path / "blacklist.json"
+        detector = ThreatDetector(blacklist_file=str(blacklist_file))
+        detector.add_to_blacklist(RECIPIENT, ThreatType.PHISHING, "test")
+        detector.add_to_blacklist("scammer.example", ThreatType.KNOWN_SCAM, "test")
+
+        reloaded = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert RECIPIENT in reloaded.blacklist
+        assert "scammer.example" in reloaded.blacklist
+        assert reloaded._log_entries == 2
+
+    def test_torn_last_line_skipped(self, tmp_path):
+        detector = ThreatDetector(blacklist_file=str(tmp_path / "blacklist.json"))
+        detector.add_to_blacklist(RECIPIENT, ThreatType.PHISHING, "test")
+        with open(detector.blacklist_log, "a") as f:
+            f.write('{"address": "' + PAYER[:10])
+
+        reloaded = ThreatDetector(blacklist_file=str(detector.blacklist_file))
+        assert RECIPIENT in reloaded.blacklist
+        assert PAYER not in reloaded.blacklist
+
+    def test_compaction(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(threat_detector, "BLACKLIST_COMPACT_EVERY", 3)
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [PAYER])
+        detector = ThreatDetector(blacklist_file=str(blacklist_file))
+
+        detector.add_to_blacklist(RECIPIENT, ThreatType.PHISHING, "one")
+        detector.add_to_blacklist(CUSTOM_PROGRAM, ThreatType.RUGPULL, "two")
+        assert len(self._log_lines(detector)) == 2
+        detector.add_to_blacklist(SYSTEM_PROGRAM, ThreatType.KNOWN_SCAM, "three")
+
+        assert not detector.blacklist_log.exists()
+        assert detector._log_entries == 0
+        data = json.loads(blacklist_file.read_text())
+        assert sorted(data["addresses"]) == sorted([PAYER, RECIPIENT, CUSTOM_PROGRAM, SYSTEM_PROGRAM])
+        assert [entry["reason"] for entry in data["history"]] == ["one", "two", "three"]
+        assert detector._snapshot_is_fresh()
+
+        reloaded = ThreatDetector(blacklist_file=str(blacklist_file))
+        assert sorted(reloaded.blacklist) == sorted(data["addresses"])
+
+    def test_compaction_keeps_history(self, tmp_path):
+        detector = ThreatDetector(blacklist_file=str(tmp_path / "blacklist.json"))
+        detector.add_to_blacklist(RECIPIENT, ThreatType.PHISHING, "first")
+        detector.compact()
+        detector.add_to_blacklist(PAYER, ThreatType.PHISHING, "second")
+        detector.compact()
+
+        data = json.loads(detector.blacklist_file.read_text())
+        assert [entry["reason"] for entry in data["history"]] == ["first", "second"]
+
+    def test_compact_without_log_is_noop(self, tmp_path):
+        blacklist_file = tmp_path / "blacklist.json"
+        _write_blacklist_json(blacklist_file, [PAYER])
+        before = blacklist_file.read_text()
+        ThreatDetector(blacklist_file=str(blacklist_file)).compact()
+        assert blacklist_file.read_text() == before
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,267 @@
+"""
+Tests for Verifiable Audit
+"""
+
+import pytest
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import verifiable_audit
+from verifiable_audit import VerifiableAudit, merkle_root
+
+
+def _make_audit(tmp_path, entries=5, name="audit.jsonl"):
+    audit = VerifiableAudit("test-agent", str(tmp_path / name))
+    for i in range(entries):
+        audit.record(f"ACTION_{i}", {"i": i}, {"ok": True}, "PASS")
+    audit.close()
+    return audit
+
+
+def _read_lines(audit):
+    with open(audit.log_file, "rb") as f:
+        return f.readlines()
+
+
+def _write_lines(audit, lines):
+    with open(audit.log_file, "wb") as f:
+        f.writelines(lines)
+
+
+def _tamper(line: bytes) -> bytes:
+    entry = json.loads(line)
+    entry["result"] = "FAIL"
+    return (json.dumps(entry) + "\n").encode()
+
+
+class TestHashChain:
+    """Test entry linking and tamper detection"""
+
+    def test_entries_linked(self, tmp_path):
+        audit = _make_audit(tmp_path, entries=3)
+        assert audit.entries[0].prev_signature == ""
+        assert audit.entries[1].prev_signature == audit.entries[0].signature
+        assert audit.entries[2].prev_signature == audit.entries[1].signature
+        assert audit.verify_log() == {"valid": True, "entries": 3, "errors": []}
+
+    def test_chain_continues_across_instances(self, tmp_path):
+        first = _make_audit(tmp_path, entries=2)
+        second = VerifiableAudit("test-agent", first.log_file)
+        entry = second.record("LATER", {}, {}, "PASS")
+        second.close()
+        assert entry.prev_signature == first.entries[-1].signature
+        assert second.verify_log()["valid"]
+
+    def test_modified_entry(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        lines = _read_lines(audit)
+        lines[2] = _tamper(lines[2])
+        _write_lines(audit, lines)
+        assert audit.verify_log()["errors"] == ["Line 3: Invalid signature"]
+
+    def test_deleted_middle_entry(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        lines = _read_lines(audit)
+        del lines[2]
+        _write_lines(audit, lines)
+        result = audit.verify_log()
+        assert not result["valid"]
+        assert result["errors"] == ["Line 3: Broken hash chain"]
+
+    def test_deleted_first_entry(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        _write_lines(audit, _read_lines(audit)[1:])
+        assert audit.verify_log()["errors"] == ["Line 1: Broken hash chain"]
+
+    def test_reordered_entries(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        lines = _read_lines(audit)
+        lines[1], lines[3] = lines[3], lines[1]
+        _write_lines(audit, lines)
+        result = audit.verify_log()
+        assert not result["valid"]
+        assert "Line 2: Broken hash chain" in result["errors"]
+        assert not audit.is_valid_fast()
+
+    def test_unchained_legacy_entries_accepted(self, tmp_path):
+        audit = _make_audit(tmp_path, entries=3)
+        lines = []
+        for line in _read_lines(audit):
+            entry = json.loads(line)
+            entry["prev_signature"] = ""
+            entry["signature"] = verifiable_audit._sign(entry)
+            lines.append((json.dumps(entry) + "\n").encode())
+        _write_lines(audit, lines)
+        assert audit.verify_log()["valid"]
+
+
+class TestCheckpoint:
+    """Test Merkle checkpoints over the log"""
+
+    def test_root_matches_signatures(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        root = audit.checkpoint()
+        assert root == merkle_root([e.signature for e in audit.entries])
+        with open(audit.checkpoint_file) as f:
+            record = json.load(f)
+        assert record["index"] == 5
+        assert record["last_signature"] == audit.entries[-1].signature
+
+    def test_merkle_root_is_order_sensitive(self):
+        assert merkle_root(["a", "b", "c"]) != merkle_root(["b", "a", "c"])
+        assert merkle_root(["a", "b", "c"]) == merkle_root(["a", "b", "c", "c"])
+
+    def test_checkpointed_prefix_skipped(self, tmp_path, monkeypatch):
+        audit = _make_audit(tmp_path)
+        audit.checkpoint()
+        audit.record("AFTER", {}, {}, "PASS")
+        audit.close()
+
+        checked = []
+        real_check_line = verifiable_audit._check_line
+        monkeypatch.setattr(verifiable_audit, "_check_line", lambda line: checked.append(line) or real_check_line(line))
+        assert audit.verify_log() == {"valid": True, "entries": 6, "errors": []}
+        assert len(checked) == 1
+
+    def test_entry_after_checkpoint_must_link(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        audit.checkpoint()
+        audit.record("AFTER", {}, {}, "PASS")
+        audit.close()
+        lines = _read_lines(audit)
+        entry = json.loads(lines[-1])
+        entry["prev_signature"] = "0" * 64
+        entry["signature"] = verifiable_audit._sign(entry)
+        lines[-1] = (json.dumps(entry) + "\n").encode()
+        _write_lines(audit, lines)
+        assert audit.verify_log()["errors"] == ["Line 6: Broken hash chain"]
+
+    @pytest.mark.parametrize("change", ["delete", "reorder", "truncate"])
+    def test_change_inside_checkpoint_detected(self, tmp_path, change):
+        audit = _make_audit(tmp_path)
+        audit.checkpoint()
+        lines = _read_lines(audit)
+        if change == "delete":
+            del lines[1]
+        elif change == "reorder":
+            lines[0], lines[1] = lines[1], lines[0]
+        else:
+            lines = lines[:-1]
+        _write_lines(audit, lines)
+
+        result = audit.verify_log()
+        assert not result["valid"]
+        assert result["errors"][0] == "Checkpoint mismatch: log changed within its first 5 entries"
+
+    def test_no_checkpoint_for_invalid_log(self, tmp_path):
+        audit = _make_audit(tmp_path)
+        lines = _read_lines(audit)
+        del lines[1]
+        _write_lines(audit, lines)
+        assert audit.checkpoint() is None
+        assert not os.path.exists(audit.checkpoint_file)
+
+
+class TestParallelVerify:
+    """Test process pool verification of large logs"""
+
+    @pytest.fixture
+    def force_parallel(self, monkeypatch):
+        pools = []
+        real_pool = verifiable_audit.ProcessPoolExecutor
+
+        def pool(*args, **kwargs):
+            pools.append(kwargs)
+            return real_pool(*args, **kwargs)
+
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(verifiable_audit, "PARALLEL_VERIFY_MIN_BYTES", 0)
+        monkeypatch.setattr(verifiable_audit, "VERIFY_BATCH_LINES", 3)
+        monkeypatch.setattr(verifiable_audit, "ProcessPoolExecutor", pool)
+        return pools
+
+    def test_parallel_matches_serial(self, tmp_path, force_parallel):
+        audit = _make_audit(tmp_path, entries=20)
+        lines = _read_lines(audit)
+        lines[7] = _tamper(lines[7])
+        _write_lines(audit, lines)
+
+        result = audit.verify_log()
+        assert result["entries"] == 20
+        assert result["errors"] == ["Line 8: Invalid signature"]
+        streamed = list(audit.iter_verify_log())
+        assert [line_num for line_num, _, _ in streamed] == list(range(1, 21))
+        assert [line_num for line_num, ok, _ in streamed if not ok] == [8]
+        assert force_parallel  # The process pool path was taken
+
+    def test_small_log_stays_serial(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool used for a small log")
+
+        monkeypatch.setattr(verifiable_audit, "ProcessPoolExecutor", no_pool)
+        assert _make_audit(tmp_path, entries=20).verify_log()["valid"]
+
+    def test_lines_consumed_in_bounded_window(self, monkeypatch):
+        monkeypatch.setattr(verifiable_audit, "VERIFY_BATCH_LINES", 4)
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield b"not json\n"
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = verifiable_audit._check_parallel(lines(), pool, workers=2)
+            first = next(results)
+            assert first[0].startswith("Parse error")
+            # At most two batches per worker were read ahead of the first result
+            assert len(consumed) <= 4 * 4
+            assert sum(1 for _ in results) == 999
+
+
+class TestRecordEncoding:
+    """Test log lines outside orjson's range"""
+
+    def test_wide_int_details(self, tmp_path):
+        audit = VerifiableAudit("test-agent", str(tmp_path / "audit.jsonl"))
+        audit.record("BIG", {}, {}, "PASS", details={"value": 2 ** 70})
+        audit.close()
+
+        assert json.loads(_read_lines(audit)[0])["details"] == {"value": 2 ** 70}
+        assert audit.verify_log()["valid"]
+
+    def test_nan_written_by_json_dumps(self, tmp_path):
+        audit = _make_audit(tmp_path, entries=2)
+        lines = _read_lines(audit)
+        entry = json.loads(lines[1])
+        entry["details"] = {"ratio": float("nan")}
+        lines[1] = (json.dumps(entry) + "\n").encode()
+        _write_lines(audit, lines)
+
+        result = audit.verify_log()
+        assert result["valid"]
+        assert result["entries"] == 2
+
+    def test_failed_write_leaves_state_unchanged(self, tmp_path):
+        audit = VerifiableAudit("test-agent", str(tmp_path / "audit.jsonl"))
+        first = audit.record("FIRST", {}, {}, "PASS")
+
+        with pytest.raises(TypeError):
+            audit.record("BAD", {}, {}, "PASS", details={"obj": object()})
+        assert audit.entries == [first]
+
+        second = audit.record("SECOND", {}, {}, "PASS")
+        assert second.prev_signature == first.signature
+        audit.close()
+        assert audit.verify_log()["valid"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
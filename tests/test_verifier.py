@@ -0,0 +1,48 @@
+"""
+Tests for Verifier
+"""
+
+import pytest
+import os
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from verifier import Verifier, _poll_until
+
+
+class TestVerifierConfig:
+    """Test the wait configuration"""
+
+    def test_default_wait(self):
+        assert Verifier().max_wait_seconds == 10
+
+    def test_positional_wait(self):
+        assert Verifier(3).max_wait_seconds == 3
+
+    def test_old_keyword_alias(self):
+        verifier = Verifier(verification_delay_seconds=5)
+        assert verifier.max_wait_seconds == 5
+        assert verifier.verification_delay == 5
+
+
+class TestPollUntil:
+    """Test polling with backoff"""
+
+    def test_returns_on_first_pass(self):
+        calls = []
+        assert _poll_until(lambda: calls.append(1) or len(calls), lambda n: n >= 1, 5) == 1
+        assert len(calls) == 1
+
+    def test_polls_until_done(self):
+        calls = []
+        result = _poll_until(lambda: calls.append(1) or len(calls), lambda n: n >= 3, 5, initial=0.001)
+        assert result == 3
+
+    def test_gives_up_at_deadline(self):
+        assert _poll_until(lambda: False, bool, 0.05, initial=0.01) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
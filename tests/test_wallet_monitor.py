@@ -0,0 +1,100 @@
+"""
+Tests for Wallet Monitor
+"""
+
+import pytest
+import os
+
+# Add src to path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import solana_rpc
+from wallet_monitor import WalletMonitor, BalanceStatus
+
+
+WALLET = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+OTHER = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+
+
+@pytest.fixture
+def rpc_calls(monkeypatch):
+    """Queue of responses served by the patched _rpc_call."""
+    calls = []
+    responses = []
+
+    def rpc_call(method, params, rpc_url=None):
+        calls.append(method)
+        return responses.pop(0)
+
+    monkeypatch.setattr(solana_rpc, "_rpc_call", rpc_call)
+    return calls, responses
+
+
+def _account(lamports):
+    return {"result": {"value": {"lamports": lamports, "owner": "11111111111111111111111111111111"}}}
+
+
+RPC_ERROR = {"error": {"message": "connection refused"}}
+
+
+class TestResultCache:
+    """Test the short-lived per-address cache"""
+
+    def test_successful_lookup_cached(self, rpc_calls):
+        calls, responses = rpc_calls
+        responses.append(_account(10**9))
+        monitor = WalletMonitor()
+
+        assert monitor.check_wallet(WALLET).status == BalanceStatus.HEALTHY
+        assert monitor.check_wallet(WALLET).status == BalanceStatus.HEALTHY
+        assert len(calls) == 1
+
+    def test_missing_account_cached(self, rpc_calls):
+        calls, responses = rpc_calls
+        responses.append({"result": {"value": None}})
+        monitor = WalletMonitor()
+
+        monitor.check_wallet(WALLET)
+        monitor.check_wallet(WALLET)
+        assert len(calls) == 1
+
+    def test_rpc_error_not_cached(self, rpc_calls):
+        calls, responses = rpc_calls
+        responses.extend([RPC_ERROR, _account(10**9)])
+        monitor = WalletMonitor()
+
+        monitor.check_wallet(WALLET)
+        assert monitor.check_wallet(WALLET).status == BalanceStatus.HEALTHY
+        assert len(calls) == 2
+
+    def test_rpc_error_drops_older_entry(self, rpc_calls):
+        calls, responses = rpc_calls
+        responses.extend([_account(10**9), RPC_ERROR, _account(10**9)])
+        monitor = WalletMonitor()
+
+        monitor.check_wallet(WALLET)
+        monitor.check_wallet(WALLET, force=True)
+        monitor.check_wallet(WALLET)
+        assert len(calls) == 3
+
+    def test_batch_error_not_cached(self, monkeypatch):
+        batches = []
+        responses = [[RPC_ERROR], [{"result": {"value": [_account(10**9)["result"]["value"], None]}}]]
+
+        def rpc_batch(requests, rpc_url=None):
+            batches.append(requests)
+            return responses.pop(0)
+
+        monkeypatch.setattr(solana_rpc, "_rpc_batch", rpc_batch)
+        monitor = WalletMonitor()
+
+        first = monitor.check_multiple([WALLET, OTHER])
+        assert first[WALLET].status == BalanceStatus.EMPTY
+        second = monitor.check_multiple([WALLET, OTHER])
+        assert second[WALLET].status == BalanceStatus.HEALTHY
+        assert len(batches) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])